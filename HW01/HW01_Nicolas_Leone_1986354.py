@@ -1,4 +1,6 @@
+from collections import Counter
 from pathlib import Path
+from string import ascii_uppercase
 
 ciphertext_path = Path(__file__).with_name("ciphertext.txt")
 ciphertext = ciphertext_path.read_text()
@@ -6,19 +8,18 @@ ciphertext = ciphertext_path.read_text()
 # ciphertext replacing 'tt' letters with '\n' char for final plaintext
 ciphertext_in_rows = ciphertext.replace("TT", "\n")
 
-# ciphertext without 'tt' letters to work on frequency analysis
-ciphertext_no_tt = ciphertext.replace("TT", "")
-
-# count the occurrences of each letter in the TT-stripped ciphertext
-ciphertext_letter_occurrences = {}
-for char in ciphertext_no_tt:
-    if char.isalpha() or char == " ":
-        ciphertext_letter_occurrences[char] = ciphertext_letter_occurrences.get(char, 0) + 1
+# count the occurrences of each letter and space in one C-level pass, then discount the 'tt' separators
+ciphertext_letter_occurrences = Counter(ciphertext)
+for char in set(ciphertext_letter_occurrences):
+    if not (char.isalpha() or char == " "):
+        del ciphertext_letter_occurrences[char]
+ciphertext_letter_occurrences["T"] -= 2 * ciphertext.count("TT")
+if ciphertext_letter_occurrences["T"] <= 0:
+    del ciphertext_letter_occurrences["T"]
 
 # sort by descending frequency so the most common letters come first
-sorted_letter_occurrences = dict(
-    sorted(ciphertext_letter_occurrences.items(), key=lambda entry: entry[1], reverse=True)
-)
+sorted_letter_occurrences = ciphertext_letter_occurrences.most_common()
+sorted_cipher_chars = [char for char, _ in sorted_letter_occurrences]
 
 print("sorted letter occurrences: " + str(sorted_letter_occurrences) + "\n")
 
@@ -54,68 +55,52 @@ frequency_reference = [
 ]
 
 # first attempt of frequency analysis decryption via frequency matching
-sorted_cipher_chars = list(sorted_letter_occurrences.keys())
-decryption_map = {
-    cipher_char: frequency_reference[idx]
-    for idx, cipher_char in enumerate(sorted_cipher_chars)
-    if idx < len(frequency_reference)
-}
-
-print("decryption map: " + str(decryption_map) + "\n")
-
-first_plaintext = "".join(
-    decryption_map.get(char, char)
-    for char in ciphertext_in_rows  
-)
+# the map is kept as two aligned strings: cipher_letters[i] decrypts to plain_letters[i]
+cipher_letters = "".join(sorted_cipher_chars[:len(frequency_reference)])
+plain_letters = "".join(frequency_reference[:len(cipher_letters)])
 
-print("first plaintext:\n" + first_plaintext)
+print("decryption map: " + str(dict(zip(cipher_letters, plain_letters))) + "\n")
 
 # being sure about the space frequency match, I manually try to adjust the results basing on common English words and patterns
+# each attempt swaps two plaintext letters, applied in order on top of the previous attempts
+manual_swaps = [
+    # second attempt - swapping O with A since the O was frequently used as a single letter word, which is usually 'A' in English
+    ("O", "A"),
+    # third attempt - swapping O with H since the word TOE is frequent in the text, and could be THE
+    ("O", "H"),
+    # fourth attempt - swapping O with N and L with D since the frequently used word AOL could be AND
+    ("O", "N"),
+    ("L", "D"),
+    # fifth attempt - swapping U with G beacuse EDUE could be EDGE since I see much words finished with -ED and I already fixed the letter E supposing it was correct call
+    ("U", "G"),
+    # sixth attempt - swapping I with O since the word BEYIND could be BEYOND
+    ("I", "O"),
+    # seventh attempt - swapping P with V since ABOPE could be ABOVE
+    ("P", "V"),
+    # eighth attempt - swapping S with I since VSLLAGE could be VILLAGE
+    ("S", "I"),
+    # ninth attempt - swapping R with S since the word HIR is frequently used and could be HIS
+    ("R", "S"),
+    # tenth attempt - swapping M with F since the word LEMT could be LEFTL
+    ("M", "F"),
+    # eleventh attempt - swapping C with W since CITH could be WITH and FOLLOCED could be FOLLOWED
+    ("C", "W"),
+    # twelfth attempt - swapping C with M since SCALL could be SMALL and AMROSS could be ACROSS
+    ("C", "M"),
+    # final attempt - swapping K with P since STEK could be STEP and SKEAP could be SPEAK
+    ("K", "P"),
+]
 
-# second attempt - swapping O with A since the O was frequently used as a single letter word, which is usually 'A' in English
-second_plaintext = first_plaintext.translate(str.maketrans({"O": "A", "A": "O"}))
-# print("second plaintext:\n" + second_plaintext)
-
-# third attempt - swapping O with H since the word TOE is frequent in the text, and could be THE 
-third_plaintext = second_plaintext.translate(str.maketrans({"O": "H", "H": "O"}))
-# print("third plaintext:\n" + third_plaintext)
-
-# fourth attempt - swapping O with N and L with D since the frequently used word AOL could be AND
-fourth_plaintext = third_plaintext.translate(str.maketrans({"O": "N", "N": "O", "L": "D", "D": "L"}))
-# print("fourth plaintext:\n" + fourth_plaintext)
-
-# fifth attempt - swapping U with G beacuse EDUE could be EDGE since I see much words finished with -ED and I already fixed the letter E supposing it was correct call
-fifth_plaintext = fourth_plaintext.translate(str.maketrans({"U": "G", "G": "U"}))
-# print("fifth plaintext:\n" + fifth_plaintext)
-
-# sixth attempt - swapping I with O since the word BEYIND could be BEYOND
-sixth_plaintext = fifth_plaintext.translate(str.maketrans({"I": "O", "O": "I"}))
-# print("sixth plaintext:\n" + sixth_plaintext)
-
-# seventh attempt - swapping P with V since ABOPE could be ABOVE
-seventh_plaintext = sixth_plaintext.translate(str.maketrans({"P": "V", "V": "P"}))
-# print("seventh plaintext:\n" + seventh_plaintext)
-
-# eighth attempt - swapping S with I since VSLLAGE could be VILLAGE
-eighth_plaintext = seventh_plaintext.translate(str.maketrans({"S": "I", "I": "S"}))
-# print("eighth plaintext:\n" + eighth_plaintext)
-
-# ninth attempt - swapping R with S since the word HIR is frequently used and could be HIS
-ninth_plaintext = eighth_plaintext.translate(str.maketrans({"R": "S", "S": "R"}))
-# print("ninth plaintext:\n" + ninth_plaintext)
-
-# tenth attempt - swapping M with F since the word LEMT could be LEFTL
-tenth_plaintext = ninth_plaintext.translate(str.maketrans({"M": "F", "F": "M"}))
-# print("tenth plaintext:\n" + tenth_plaintext)
+# letters left out of the frequency match decrypt to themselves before the swaps
+unmatched_letters = "".join(char for char in ascii_uppercase if char not in cipher_letters)
+cipher_letters += unmatched_letters
+plain_letters += unmatched_letters
 
-# eleventh attempt - swapping C with W since CITH could be WITH and FOLLOCED could be FOLLOWED
-eleventh_plaintext = tenth_plaintext.translate(str.maketrans({"C": "W", "W": "C"}))
-# print("eleventh plaintext:\n" + eleventh_plaintext)
+# compose every manual swap at string level, so the ciphertext is translated only once
+for x, y in manual_swaps:
+    plain_letters = plain_letters.translate(str.maketrans(x + y, y + x))
 
-# twelfth attempt - swapping C with M since SCALL could be SMALL and AMROSS could be ACROSS
-twelfth_plaintext = eleventh_plaintext.translate(str.maketrans({"C": "M", "M": "C"}))
-#print("twelfth plaintext:\n" + twelfth_plaintext)
+decryption_table = str.maketrans(cipher_letters, plain_letters)
 
-# final attempt - swapping K with P since STEK could be STEP and SKEAP could be SPEAK
-final_plaintext = twelfth_plaintext.translate(str.maketrans({"K": "P", "P": "K"}))
+final_plaintext = ciphertext_in_rows.translate(decryption_table)
 print("final plaintext:\n" + final_plaintext)
@@ -5,8 +5,8 @@ Used for HW02 - Cybersecurity course
 Author: Nicolas Leone
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # Data from the encryption/decryption tests (in microseconds)
 # Results from HW02_Nicolas_Leone_1986354.c execution
@@ -29,22 +29,84 @@ decryption_times = {
     '2MB': [241, 11365, 6564]
 }
 
-import matplotlib.pyplot as plt
-import numpy as np
+# Colors shared by the PNG and SVG charts
+ENC_COLOR = '#e67e22'
+DEC_COLOR = '#9b59b6'
 
-# Set style for better-looking plots
-plt.style.use('seaborn-v0_8-darkgrid')
+# SVG layout (pixels)
+SVG_WIDTH, SVG_HEIGHT = 1000, 600
+SVG_LEFT, SVG_RIGHT, SVG_TOP, SVG_BOTTOM = 90, 30, 70, 80
 
-# Data for 16B file (in microseconds)
-algorithms = ['AES-128-CBC', 'SM4-128-CBC', 'Camellia-128-CBC']
-encryption_16B = [2, 485, 3]
-decryption_16B = [1, 2, 1]
 
-# === Generate one graph per file size ===
-print("Generating performance charts...\n")
+def _svg_bar_chart(title, labels, enc, dec, path):
+    """Write a grouped encryption/decryption bar chart as a plain SVG file (no matplotlib needed)"""
+    plot_w = SVG_WIDTH - SVG_LEFT - SVG_RIGHT
+    plot_h = SVG_HEIGHT - SVG_TOP - SVG_BOTTOM
+    y_max = max(enc + dec) or 1
+    group_w = plot_w / len(labels)
+    bar_w = group_w * 0.35
+    base_y = SVG_TOP + plot_h
+    
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{SVG_HEIGHT}" '
+        f'font-family="sans-serif">',
+        f'<rect width="{SVG_WIDTH}" height="{SVG_HEIGHT}" fill="white"/>',
+        f'<rect x="{SVG_LEFT}" y="{SVG_TOP}" width="{plot_w}" height="{plot_h}" fill="#f8f9fa"/>',
+        f'<text x="{SVG_WIDTH / 2}" y="{SVG_TOP / 2}" text-anchor="middle" font-size="20" '
+        f'font-weight="bold">{title}</text>',
+        f'<line x1="{SVG_LEFT}" y1="{base_y}" x2="{SVG_LEFT + plot_w}" y2="{base_y}" stroke="black"/>',
+        f'<text x="{SVG_LEFT / 3}" y="{SVG_TOP + plot_h / 2}" text-anchor="middle" font-size="16" '
+        f'font-weight="bold" transform="rotate(-90 {SVG_LEFT / 3} {SVG_TOP + plot_h / 2})">'
+        f'Time (microseconds)</text>',
+    ]
+    
+    for i, label in enumerate(labels):
+        center = SVG_LEFT + group_w * (i + 0.5)
+        for x, value, color in ((center - bar_w, enc[i], ENC_COLOR), (center, dec[i], DEC_COLOR)):
+            bar_h = value / y_max * plot_h
+            parts.append(f'<rect x="{x:.1f}" y="{base_y - bar_h:.1f}" width="{bar_w:.1f}" '
+                         f'height="{bar_h:.1f}" fill="{color}" fill-opacity="0.85" stroke="black"/>')
+            parts.append(f'<text x="{x + bar_w / 2:.1f}" y="{base_y - bar_h - 4:.1f}" text-anchor="middle" '
+                         f'font-size="13" font-weight="bold">{int(value)}</text>')
+        parts.append(f'<text x="{center:.1f}" y="{base_y + 25}" text-anchor="middle" font-size="14">'
+                     f'{label}</text>')
+    
+    for i, (name, color) in enumerate((('Encryption', ENC_COLOR), ('Decryption', DEC_COLOR))):
+        y = SVG_TOP + 15 + i * 22
+        parts.append(f'<rect x="{SVG_LEFT + 15}" y="{y}" width="16" height="12" fill="{color}" stroke="black"/>')
+        parts.append(f'<text x="{SVG_LEFT + 38}" y="{y + 11}" font-size="14">{name}</text>')
+    
+    parts.append('</svg>\n')
+    with open(path, 'w') as f:
+        f.write('\n'.join(parts))
 
-for file_size in file_names:
-    fig, ax = plt.subplots(figsize=(10, 6))
+
+def create_svg_chart(file_size):
+    """Save the encryption/decryption chart for one file size as SVG"""
+    filename = f'performance_{file_size}.svg'
+    _svg_bar_chart(f'Encryption vs Decryption Performance - {file_size} File', algorithms,
+                   encryption_times[file_size], decryption_times[file_size], filename)
+    return filename
+
+
+def _init_worker():
+    """Load matplotlib and apply the plot style once per worker process"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    
+    # Set style for better-looking plots
+    plt.style.use('seaborn-v0_8-darkgrid')
+
+
+# === Generate one graph per file size ===
+def create_chart(file_size):
+    """Render and save the encryption/decryption bar chart for one file size"""
+    # matplotlib/numpy are only imported here, so the SVG mode never pays their start-up cost
+    import matplotlib.pyplot as plt
+    import numpy as np
+    
+    fig, ax = plt.subplots(figsize=(10, 6), constrained_layout=True)
     
     x_pos = np.arange(len(algorithms))
     width = 0.35
@@ -55,9 +117,9 @@ for file_size in file_names:
     
     # Create bars
     bars1 = ax.bar(x_pos - width/2, enc_times, width, label='Encryption', 
-                   color='#e67e22', alpha=0.85, edgecolor='black', linewidth=1.2)
+                   color=ENC_COLOR, alpha=0.85, edgecolor='black', linewidth=1.2)
     bars2 = ax.bar(x_pos + width/2, dec_times, width, label='Decryption', 
-                   color='#9b59b6', alpha=0.85, edgecolor='black', linewidth=1.2)
+                   color=DEC_COLOR, alpha=0.85, edgecolor='black', linewidth=1.2)
     
     # Customize the plot
     ax.set_xlabel('Algorithm', fontsize=13, fontweight='bold')
@@ -71,27 +133,41 @@ for file_size in file_names:
     
     # Add value labels on bars
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height)}',
-                   ha='center', va='bottom', fontsize=10, fontweight='bold')
+        ax.bar_label(bars, fmt='%d', fontsize=10, fontweight='bold', padding=2)
     
     # Add a subtle background color
     ax.set_facecolor('#f8f9fa')
     fig.patch.set_facecolor('white')
     
-    plt.tight_layout()
     filename = f'performance_{file_size}.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"✓ Generated: {filename}")
-    plt.close()
-
-print("\n" + "="*50)
-print("All charts generated successfully!")
-print("="*50)
-print("\nGenerated files:")
-print("  1. performance_16B.png")
-print("  2. performance_20KB.png")
-print("  3. performance_2MB.png")
-print("\nYou can now include these charts in your LaTeX document!")
+    fig.savefig(filename, dpi=300, pil_kwargs={'compress_level': 1})
+    plt.close(fig)
+    return filename
+
+
+def main():
+    print("Generating performance charts...\n")
+    
+    if '--svg' in sys.argv[1:]:
+        # Plain SVG output: a few string formats, no plotting library involved
+        for filename in map(create_svg_chart, file_names):
+            print(f"✓ Generated: {filename}")
+        return
+    
+    # Each file size is an independent chart, so they are rendered in parallel worker processes
+    with ProcessPoolExecutor(max_workers=len(file_names), initializer=_init_worker) as executor:
+        for filename in executor.map(create_chart, file_names):
+            print(f"✓ Generated: {filename}")
+    
+    print("\n" + "="*50)
+    print("All charts generated successfully!")
+    print("="*50)
+    print("\nGenerated files:")
+    print("  1. performance_16B.png")
+    print("  2. performance_20KB.png")
+    print("  3. performance_2MB.png")
+    print("\nYou can now include these charts in your LaTeX document!")
+
+
+if __name__ == '__main__':
+    main()
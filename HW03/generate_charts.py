@@ -5,32 +5,31 @@ Used for HW03 - Cybersecurity course
 Author: Nicolas Leone - Student ID: 1986354
 """
 
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
-import csv
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Per-worker figure, created once by _init_worker and reused by every chart the worker renders
+_worker_fig = None
+_worker_ax = None
 
 def read_results(filename='results.csv'):
     """Read results from CSV file"""
-    algorithms = []
-    avg_enc = []
-    avg_dec = []
-    min_enc = []
-    max_enc = []
-    min_dec = []
-    max_dec = []
-    
     try:
-        with open(filename, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                algorithms.append(row['Algorithm'])
-                avg_enc.append(float(row['Avg_Encryption_us']))
-                avg_dec.append(float(row['Avg_Decryption_us']))
-                min_enc.append(float(row['Min_Enc_us']))
-                max_enc.append(float(row['Max_Enc_us']))
-                min_dec.append(float(row['Min_Dec_us']))
-                max_dec.append(float(row['Max_Dec_us']))
+        # Parse the whole file in C; atleast_1d keeps single-row files indexable
+        data = np.atleast_1d(np.genfromtxt(filename, delimiter=',', names=True,
+                                           dtype=None, encoding='utf-8'))
+        algorithms = data['Algorithm'].tolist()
+        avg_enc = data['Avg_Encryption_us'].astype(float)
+        avg_dec = data['Avg_Decryption_us'].astype(float)
+        min_enc = data['Min_Enc_us'].astype(float)
+        max_enc = data['Max_Enc_us'].astype(float)
+        min_dec = data['Min_Dec_us'].astype(float)
+        max_dec = data['Max_Dec_us'].astype(float)
     except FileNotFoundError:
         print(f"Error: {filename} not found!")
         print("Please run the C program first to generate results.")
@@ -39,13 +38,15 @@ def read_results(filename='results.csv'):
         print(f"Error reading results: {e}")
         sys.exit(1)
     
-    return algorithms, avg_enc, avg_dec, min_enc, max_enc, min_dec, max_dec
+    # Error bars (distance from average to min/max), shape (2, n_algos) as errorbar expects
+    yerr_enc = np.stack([avg_enc - min_enc, max_enc - avg_enc])
+    yerr_dec = np.stack([avg_dec - min_dec, max_dec - avg_dec])
+    
+    return algorithms, avg_enc, avg_dec, yerr_enc, yerr_dec
 
-def create_comparison_chart(algorithms, avg_enc, avg_dec):
+def create_comparison_chart(fig, ax, algorithms, avg_enc, avg_dec):
     """Create bar chart comparing encryption and decryption times"""
-    plt.style.use('seaborn-v0_8-darkgrid')
-    
-    fig, ax = plt.subplots(figsize=(12, 7))
+    ax.clear()
     
     x_pos = np.arange(len(algorithms))
     width = 0.35
@@ -68,38 +69,26 @@ def create_comparison_chart(algorithms, avg_enc, avg_dec):
     
     # Add value labels on bars
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height)}',
-                   ha='center', va='bottom', fontsize=9, fontweight='bold')
+        ax.bar_label(bars, fmt='%d', fontsize=9, fontweight='bold', padding=2)
     
     # Set background colors
     ax.set_facecolor('#f8f9fa')
     fig.patch.set_facecolor('white')
     
-    plt.tight_layout()
     filename = 'performance_comparison.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"✓ Generated: {filename}")
-    plt.close()
+    fig.savefig(filename, dpi=300, pil_kwargs={'compress_level': 1})
+    return filename
 
-def create_encryption_chart(algorithms, avg_enc, min_enc, max_enc):
+def create_encryption_chart(fig, ax, algorithms, avg_enc, yerr_enc):
     """Create bar chart with error bars for encryption times"""
-    plt.style.use('seaborn-v0_8-darkgrid')
-    
-    fig, ax = plt.subplots(figsize=(12, 7))
+    ax.clear()
     
     x_pos = np.arange(len(algorithms))
     
-    # Calculate error bars (distance from average to min/max)
-    yerr_lower = [avg - min_val for avg, min_val in zip(avg_enc, min_enc)]
-    yerr_upper = [max_val - avg for avg, max_val in zip(avg_enc, max_enc)]
-    
     # Create bars with error bars
     bars = ax.bar(x_pos, avg_enc, color='#3498db', alpha=0.85, 
                   edgecolor='black', linewidth=1.2, label='Average')
-    ax.errorbar(x_pos, avg_enc, yerr=[yerr_lower, yerr_upper], 
+    ax.errorbar(x_pos, avg_enc, yerr=yerr_enc, 
                 fmt='none', ecolor='red', capsize=5, capthick=2, 
                 linewidth=2, label='Min/Max Range')
     
@@ -114,38 +103,26 @@ def create_encryption_chart(algorithms, avg_enc, min_enc, max_enc):
     ax.grid(axis='y', alpha=0.3, linestyle='--')
     
     # Add value labels
-    for i, (bar, avg, min_val, max_val) in enumerate(zip(bars, avg_enc, min_enc, max_enc)):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-               f'{int(avg)}',
-               ha='center', va='bottom', fontsize=9, fontweight='bold')
+    ax.bar_label(bars, labels=[f'{int(avg)}' for avg in avg_enc], fontsize=9, fontweight='bold', padding=2)
     
     # Set background colors
     ax.set_facecolor('#f8f9fa')
     fig.patch.set_facecolor('white')
     
-    plt.tight_layout()
     filename = 'encryption_performance.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"✓ Generated: {filename}")
-    plt.close()
+    fig.savefig(filename, dpi=300, pil_kwargs={'compress_level': 1})
+    return filename
 
-def create_decryption_chart(algorithms, avg_dec, min_dec, max_dec):
+def create_decryption_chart(fig, ax, algorithms, avg_dec, yerr_dec):
     """Create bar chart with error bars for decryption times"""
-    plt.style.use('seaborn-v0_8-darkgrid')
-    
-    fig, ax = plt.subplots(figsize=(12, 7))
+    ax.clear()
     
     x_pos = np.arange(len(algorithms))
     
-    # Calculate error bars
-    yerr_lower = [avg - min_val for avg, min_val in zip(avg_dec, min_dec)]
-    yerr_upper = [max_val - avg for avg, max_val in zip(avg_dec, max_dec)]
-    
     # Create bars with error bars
     bars = ax.bar(x_pos, avg_dec, color='#2ecc71', alpha=0.85, 
                   edgecolor='black', linewidth=1.2, label='Average')
-    ax.errorbar(x_pos, avg_dec, yerr=[yerr_lower, yerr_upper], 
+    ax.errorbar(x_pos, avg_dec, yerr=yerr_dec, 
                 fmt='none', ecolor='red', capsize=5, capthick=2, 
                 linewidth=2, label='Min/Max Range')
     
@@ -160,31 +137,23 @@ def create_decryption_chart(algorithms, avg_dec, min_dec, max_dec):
     ax.grid(axis='y', alpha=0.3, linestyle='--')
     
     # Add value labels
-    for i, (bar, avg) in enumerate(zip(bars, avg_dec)):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-               f'{int(avg)}',
-               ha='center', va='bottom', fontsize=9, fontweight='bold')
+    ax.bar_label(bars, labels=[f'{int(avg)}' for avg in avg_dec], fontsize=9, fontweight='bold', padding=2)
     
     # Set background colors
     ax.set_facecolor('#f8f9fa')
     fig.patch.set_facecolor('white')
     
-    plt.tight_layout()
     filename = 'decryption_performance.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"✓ Generated: {filename}")
-    plt.close()
+    fig.savefig(filename, dpi=300, pil_kwargs={'compress_level': 1})
+    return filename
 
-def create_throughput_chart(algorithms, avg_enc, avg_dec, file_size_mb):
+def create_throughput_chart(fig, ax, algorithms, avg_enc, avg_dec, file_size_mb):
     """Create chart showing throughput in MB/s"""
-    plt.style.use('seaborn-v0_8-darkgrid')
+    ax.clear()
     
     # Calculate throughput in MB/s
-    enc_throughput = [(file_size_mb / (time / 1000000.0)) for time in avg_enc]
-    dec_throughput = [(file_size_mb / (time / 1000000.0)) for time in avg_dec]
-    
-    fig, ax = plt.subplots(figsize=(12, 7))
+    enc_throughput = file_size_mb / (avg_enc / 1000000.0)
+    dec_throughput = file_size_mb / (avg_dec / 1000000.0)
     
     x_pos = np.arange(len(algorithms))
     width = 0.35
@@ -207,21 +176,36 @@ def create_throughput_chart(algorithms, avg_enc, avg_dec, file_size_mb):
     
     # Add value labels on bars
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.1f}',
-                   ha='center', va='bottom', fontsize=9, fontweight='bold')
+        ax.bar_label(bars, fmt='%.1f', fontsize=9, fontweight='bold', padding=2)
     
     # Set background colors
     ax.set_facecolor('#f8f9fa')
     fig.patch.set_facecolor('white')
     
-    plt.tight_layout()
     filename = 'throughput_comparison.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"✓ Generated: {filename}")
-    plt.close()
+    fig.savefig(filename, dpi=300, pil_kwargs={'compress_level': 1})
+    return filename
+
+def is_up_to_date(target, sources):
+    """True if target exists and is newer than every source file (so it can be skipped)"""
+    try:
+        target_mtime = os.path.getmtime(target)
+    except OSError:
+        return False
+    return all(os.path.getmtime(source) < target_mtime for source in sources)
+
+def _init_worker():
+    """Apply the plot style and create the reusable figure once per worker process"""
+    # This is the only place the style is set: chart functions must not call
+    # plt.style.use themselves, as each call re-parses the style sheet
+    global _worker_fig, _worker_ax
+    plt.style.use('seaborn-v0_8-darkgrid')
+    _worker_fig, _worker_ax = plt.subplots(figsize=(12, 7), constrained_layout=True)
+
+def _render_chart(job):
+    """Run one (chart function, args) job on the worker's figure"""
+    chart_fn, args = job
+    return chart_fn(_worker_fig, _worker_ax, *args)
 
 def main():
     print("="*60)
@@ -233,22 +217,39 @@ def main():
     
     # Read results
     print("Reading results from CSV file...")
-    algorithms, avg_enc, avg_dec, min_enc, max_enc, min_dec, max_dec = read_results()
+    algorithms, avg_enc, avg_dec, yerr_enc, yerr_dec = read_results()
     
     print(f"Found {len(algorithms)} algorithm configurations:")
     for i, algo in enumerate(algorithms):
         print(f"  {i+1}. {algo}")
     print()
     
-    # Generate charts
-    print("Generating charts...\n")
-    create_comparison_chart(algorithms, avg_enc, avg_dec)
-    create_encryption_chart(algorithms, avg_enc, min_enc, max_enc)
-    create_decryption_chart(algorithms, avg_dec, min_dec, max_dec)
-    
     # Calculate file size from first algorithm's average time (10 MB expected)
     file_size_mb = 10.0  # As specified in generate_testfile.c
-    create_throughput_chart(algorithms, avg_enc, avg_dec, file_size_mb)
+    
+    # Generate charts; they are independent, so each one is rendered in a worker process.
+    # Charts newer than both the CSV and this script are skipped unless --force is given.
+    print("Generating charts...\n")
+    jobs = [
+        ('performance_comparison.png', create_comparison_chart, (algorithms, avg_enc, avg_dec)),
+        ('encryption_performance.png', create_encryption_chart, (algorithms, avg_enc, yerr_enc)),
+        ('decryption_performance.png', create_decryption_chart, (algorithms, avg_dec, yerr_dec)),
+        ('throughput_comparison.png', create_throughput_chart,
+         (algorithms, avg_enc, avg_dec, file_size_mb)),
+    ]
+    force = '--force' in sys.argv[1:]
+    sources = ['results.csv', __file__]
+    pending = []
+    for filename, chart_fn, args in jobs:
+        if not force and is_up_to_date(filename, sources):
+            print(f"• Up to date: {filename}")
+        else:
+            pending.append((chart_fn, args))
+    
+    if pending:
+        with ProcessPoolExecutor(max_workers=len(pending), initializer=_init_worker) as executor:
+            for filename in executor.map(_render_chart, pending):
+                print(f"✓ Generated: {filename}")
     
     print("\n" + "="*60)
     print("All charts generated successfully!")
@@ -5,73 +5,93 @@ Used for HW03 - Cybersecurity course
 Author: Nicolas Leone - Student ID: 1986354
 """
 
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
-import csv
+from concurrent.futures import ProcessPoolExecutor
 import os
 import sys
 import glob
+import re
+
+# Same skip-if-newer check as the single-file charts
+from generate_charts import is_up_to_date
+
+# Per-algorithm plot styling, shared by every chart
+_COLORS = ('#e67e22', '#3498db', '#2ecc71', '#9b59b6')
+_MARKERS = ('o', 's', '^', 'D')
+
+# Text style for heatmap cell annotations
+_TXT_KW = dict(ha="center", va="center", color="black", fontsize=9, fontweight='bold')
+
+# Matches per-size result files such as results_testfile_10MB.bin.csv
+_SIZE_RE = re.compile(r'results_testfile_(\d+)MB\.bin\.csv$')
 
 def read_all_results():
-    """Read all results_*.csv files"""
-    results = {}
-    
-    for csv_file in sorted(glob.glob("results_testfile_*.csv")):
-        # Extract file size from filename
-        size_str = csv_file.replace("results_testfile_", "").replace(".csv", "")
-        
-        algorithms = []
-        avg_enc = []
-        avg_dec = []
+    """Read all results_*.csv files into dense (n_sizes, n_algos) matrices"""
+    per_size = {}
+    
+    for csv_file in glob.iglob("results_testfile_*.csv"):
+        # Extract file size in MB from filename
+        match = _SIZE_RE.match(csv_file)
+        if match is None:
+            print(f"✗ Skipping {csv_file}: unrecognized file name")
+            continue
+        size_mb = int(match.group(1))
+        size_str = f"{size_mb}MB.bin"
         
         try:
-            with open(csv_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    algorithms.append(row['Algorithm'])
-                    avg_enc.append(float(row['Avg_Encryption_us']))
-                    avg_dec.append(float(row['Avg_Decryption_us']))
-            
-            results[size_str] = {
-                'algorithms': algorithms,
-                'encryption': avg_enc,
-                'decryption': avg_dec
-            }
+            data = np.atleast_1d(np.genfromtxt(csv_file, delimiter=',', names=True, dtype=None,
+                                               encoding='utf-8',
+                                               usecols=('Algorithm', 'Avg_Encryption_us',
+                                                        'Avg_Decryption_us')))
+            per_size[size_mb] = (data['Algorithm'].tolist(),
+                                  data['Avg_Encryption_us'].astype(float),
+                                  data['Avg_Decryption_us'].astype(float))
             print(f"✓ Loaded: {csv_file} ({size_str})")
         except Exception as e:
             print(f"✗ Error reading {csv_file}: {e}")
     
-    return results
-
-def extract_size_mb(size_str):
-    """Extract numeric size in MB from size string"""
-    return int(size_str.replace("MB.bin", ""))
+    if not per_size:
+        return {}
+    
+    # Sort by file size and use the first file's algorithm order as the column order
+    sorted_sizes = sorted(per_size)
+    algorithms = per_size[sorted_sizes[0]][0]
+    algo_to_col = {algo: col for col, algo in enumerate(algorithms)}
+    
+    enc_matrix = np.full((len(sorted_sizes), len(algorithms)), np.nan)
+    dec_matrix = np.full((len(sorted_sizes), len(algorithms)), np.nan)
+    
+    for row, size in enumerate(sorted_sizes):
+        for algo, enc, dec in zip(*per_size[size]):
+            col = algo_to_col.get(algo)
+            if col is not None:
+                enc_matrix[row, col] = enc
+                dec_matrix[row, col] = dec
+    
+    return {
+        'sizes': [f"{size_mb}MB.bin" for size_mb in sorted_sizes],
+        'file_sizes_mb': np.array(sorted_sizes, dtype=float),
+        'algorithms': algorithms,
+        'encryption': enc_matrix,
+        'decryption': dec_matrix
+    }
 
 def create_scaling_chart(results):
     """Create chart showing how performance scales with file size"""
-    plt.style.use('seaborn-v0_8-darkgrid')
-    
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6), constrained_layout=True)
     
-    # Sort by file size
-    sorted_sizes = sorted(results.keys(), key=extract_size_mb)
-    
-    # Extract data for each algorithm
-    algorithms = results[sorted_sizes[0]]['algorithms']
-    colors = ['#e67e22', '#3498db', '#2ecc71', '#9b59b6']
-    markers = ['o', 's', '^', 'D']
-    
-    file_sizes_mb = [extract_size_mb(s) for s in sorted_sizes]
+    algorithms = results['algorithms']
+    file_sizes_mb = results['file_sizes_mb']
+    enc_times = results['encryption'] / 1000.0  # Convert to ms
+    dec_times = results['decryption'] / 1000.0  # Convert to ms
     
     # Plot encryption performance scaling
     for i, algo in enumerate(algorithms):
-        enc_times = []
-        for size in sorted_sizes:
-            idx = results[size]['algorithms'].index(algo)
-            enc_times.append(results[size]['encryption'][idx] / 1000.0)  # Convert to ms
-        
-        ax1.plot(file_sizes_mb, enc_times, marker=markers[i], linewidth=2, 
-                markersize=8, label=algo, color=colors[i])
+        ax1.plot(file_sizes_mb, enc_times[:, i], marker=_MARKERS[i], linewidth=2, 
+                markersize=8, label=algo, color=_COLORS[i])
     
     ax1.set_xlabel('File Size (MB)', fontsize=13, fontweight='bold')
     ax1.set_ylabel('Encryption Time (milliseconds)', fontsize=13, fontweight='bold')
@@ -84,13 +104,8 @@ def create_scaling_chart(results):
     
     # Plot decryption performance scaling
     for i, algo in enumerate(algorithms):
-        dec_times = []
-        for size in sorted_sizes:
-            idx = results[size]['algorithms'].index(algo)
-            dec_times.append(results[size]['decryption'][idx] / 1000.0)  # Convert to ms
-        
-        ax2.plot(file_sizes_mb, dec_times, marker=markers[i], linewidth=2,
-                markersize=8, label=algo, color=colors[i])
+        ax2.plot(file_sizes_mb, dec_times[:, i], marker=_MARKERS[i], linewidth=2,
+                markersize=8, label=algo, color=_COLORS[i])
     
     ax2.set_xlabel('File Size (MB)', fontsize=13, fontweight='bold')
     ax2.set_ylabel('Decryption Time (milliseconds)', fontsize=13, fontweight='bold')
@@ -102,44 +117,31 @@ def create_scaling_chart(results):
     ax2.set_facecolor('#f8f9fa')
     
     fig.patch.set_facecolor('white')
-    plt.tight_layout()
     filename = 'performance_scaling.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"✓ Generated: {filename}")
-    plt.close()
+    fig.savefig(filename, dpi=300, pil_kwargs={'compress_level': 1})
+    plt.close(fig)
+    return filename
 
 def create_throughput_chart(results):
     """Create chart showing throughput for different file sizes"""
-    plt.style.use('seaborn-v0_8-darkgrid')
-    
-    fig, ax = plt.subplots(figsize=(14, 7))
+    fig, ax = plt.subplots(figsize=(14, 7), constrained_layout=True)
     
-    sorted_sizes = sorted(results.keys(), key=extract_size_mb)
-    algorithms = results[sorted_sizes[0]]['algorithms']
+    sorted_sizes = results['sizes']
+    algorithms = results['algorithms']
     
     x = np.arange(len(sorted_sizes))
     width = 0.2
-    colors = ['#e67e22', '#3498db', '#2ecc71', '#9b59b6']
+    
+    # Throughput in MB/s for every (size, algorithm) cell at once
+    throughputs = results['file_sizes_mb'][:, None] / (results['encryption'] / 1000000.0)
     
     for i, algo in enumerate(algorithms):
-        throughputs = []
-        for size in sorted_sizes:
-            size_mb = extract_size_mb(size)
-            idx = results[size]['algorithms'].index(algo)
-            avg_time_us = results[size]['encryption'][idx]
-            throughput = (size_mb / (avg_time_us / 1000000.0))
-            throughputs.append(throughput)
-        
         offset = (i - len(algorithms)/2 + 0.5) * width
-        bars = ax.bar(x + offset, throughputs, width, label=algo, 
-                     color=colors[i], alpha=0.85, edgecolor='black', linewidth=1.2)
+        bars = ax.bar(x + offset, throughputs[:, i], width, label=algo, 
+                     color=_COLORS[i], alpha=0.85, edgecolor='black', linewidth=1.2)
         
         # Add value labels
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.0f}',
-                   ha='center', va='bottom', fontsize=8, fontweight='bold')
+        ax.bar_label(bars, fmt='%.0f', fontsize=8, fontweight='bold', padding=2)
     
     ax.set_xlabel('File Size', fontsize=13, fontweight='bold')
     ax.set_ylabel('Throughput (MB/s)', fontsize=13, fontweight='bold')
@@ -152,37 +154,28 @@ def create_throughput_chart(results):
     ax.set_facecolor('#f8f9fa')
     fig.patch.set_facecolor('white')
     
-    plt.tight_layout()
     filename = 'throughput_scaling.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"✓ Generated: {filename}")
-    plt.close()
+    fig.savefig(filename, dpi=300, pil_kwargs={'compress_level': 1})
+    plt.close(fig)
+    return filename
+
+def _annotate_heatmap(ax, matrix):
+    """Write each cell value of an imshow'd matrix on top of its cell"""
+    labels = np.char.mod('%.1f', matrix)
+    text = ax.text
+    for (i, j), label in np.ndenumerate(labels):
+        text(j, i, label, **_TXT_KW)
 
 def create_comparison_heatmap(results):
     """Create heatmap showing relative performance"""
-    plt.style.use('seaborn-v0_8-darkgrid')
-    
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-    
-    sorted_sizes = sorted(results.keys(), key=extract_size_mb)
-    algorithms = results[sorted_sizes[0]]['algorithms']
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6), constrained_layout=True)
     
-    # Create matrices for encryption and decryption
-    enc_matrix = []
-    dec_matrix = []
+    sorted_sizes = results['sizes']
+    algorithms = results['algorithms']
     
-    for size in sorted_sizes:
-        enc_row = []
-        dec_row = []
-        for algo in algorithms:
-            idx = results[size]['algorithms'].index(algo)
-            enc_row.append(results[size]['encryption'][idx] / 1000.0)  # ms
-            dec_row.append(results[size]['decryption'][idx] / 1000.0)  # ms
-        enc_matrix.append(enc_row)
-        dec_matrix.append(dec_row)
-    
-    enc_matrix = np.array(enc_matrix)
-    dec_matrix = np.array(dec_matrix)
+    # Matrices for encryption and decryption, one row per file size
+    enc_matrix = results['encryption'] / 1000.0  # ms
+    dec_matrix = results['decryption'] / 1000.0  # ms
     
     # Plot encryption heatmap
     im1 = ax1.imshow(enc_matrix.T, aspect='auto', cmap='YlOrRd', interpolation='nearest')
@@ -195,10 +188,7 @@ def create_comparison_heatmap(results):
     ax1.set_title('Encryption Time Heatmap (ms)', fontsize=14, fontweight='bold', pad=15)
     
     # Add text annotations
-    for i in range(len(algorithms)):
-        for j in range(len(sorted_sizes)):
-            text = ax1.text(j, i, f'{enc_matrix[j, i]:.1f}',
-                          ha="center", va="center", color="black", fontsize=9, fontweight='bold')
+    _annotate_heatmap(ax1, enc_matrix.T)
     
     plt.colorbar(im1, ax=ax1, label='Time (ms)')
     
@@ -213,19 +203,21 @@ def create_comparison_heatmap(results):
     ax2.set_title('Decryption Time Heatmap (ms)', fontsize=14, fontweight='bold', pad=15)
     
     # Add text annotations
-    for i in range(len(algorithms)):
-        for j in range(len(sorted_sizes)):
-            text = ax2.text(j, i, f'{dec_matrix[j, i]:.1f}',
-                          ha="center", va="center", color="black", fontsize=9, fontweight='bold')
+    _annotate_heatmap(ax2, dec_matrix.T)
     
     plt.colorbar(im2, ax=ax2, label='Time (ms)')
     
     fig.patch.set_facecolor('white')
-    plt.tight_layout()
     filename = 'performance_heatmap.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"✓ Generated: {filename}")
-    plt.close()
+    fig.savefig(filename, dpi=300, pil_kwargs={'compress_level': 1})
+    plt.close(fig)
+    return filename
+
+def _init_worker():
+    """Apply the plot style once per worker process"""
+    # This is the only place the style is set: chart functions must not call
+    # plt.style.use themselves, as each call re-parses the style sheet
+    plt.style.use('seaborn-v0_8-darkgrid')
 
 def main():
     print("="*70)
@@ -244,14 +236,31 @@ def main():
         print("  Please run the tests first with: ./run_all_tests.sh")
         sys.exit(1)
     
-    print(f"\nFound results for {len(results)} file sizes")
+    print(f"\nFound results for {len(results['sizes'])} file sizes")
     print()
     
-    # Generate charts
+    # Generate charts; they are independent, so each one is rendered in a worker process.
+    # Charts newer than every results CSV and this script are skipped unless --force is given.
     print("Generating charts...\n")
-    create_scaling_chart(results)
-    create_throughput_chart(results)
-    create_comparison_heatmap(results)
+    charts = [
+        ('performance_scaling.png', create_scaling_chart),
+        ('throughput_scaling.png', create_throughput_chart),
+        ('performance_heatmap.png', create_comparison_heatmap),
+    ]
+    force = '--force' in sys.argv[1:]
+    sources = glob.glob("results_testfile_*.csv") + [__file__]
+    pending = []
+    for filename, chart_fn in charts:
+        if not force and is_up_to_date(filename, sources):
+            print(f"• Up to date: {filename}")
+        else:
+            pending.append(chart_fn)
+    
+    if pending:
+        with ProcessPoolExecutor(max_workers=len(pending), initializer=_init_worker) as executor:
+            futures = [executor.submit(chart_fn, results) for chart_fn in pending]
+            for future in futures:
+                print(f"✓ Generated: {future.result()}")
     
     print("\n" + "="*70)
     print("All charts generated successfully!")
@@ -12,6 +12,7 @@ Protocol Flow (Alice's perspective):
 6. Receive game result
 """
 
+import logging
 import socket
 import sys
 import os
@@ -22,151 +23,170 @@ import time
 sys.path.insert(0, '/app/shared')
 
 from protocol import (
-    CommitmentScheme, GameLogic, VALID_MOVES,
+    CommitmentScheme, VALID_MOVES,
     MSG_COMMIT, MSG_MOVE, MSG_REVEAL, MSG_RESULT, MSG_ERROR,
-    send_message, receive_message
+    send_message, receive_message, setup_logging, connect_to_server
 )
 
+log = logging.getLogger(__name__)
+
+# Fixed-order move list, so choose_move indexes it instead of copying the set each call
+_MOVES = tuple(sorted(VALID_MOVES))
+
 
 class AliceClient:
     """Alice's client implementation."""
     
-    def __init__(self, server_host='bob', server_port=5555):
+    def __init__(self, server_host='bob', server_port=5555, connect_timeout=0):
         self.server_host = server_host
         self.server_port = server_port
-        self.commitment_scheme = CommitmentScheme()
-        self.game_logic = GameLogic()
+        self.connect_timeout = connect_timeout
     
     def choose_move(self):
         """Alice randomly chooses a move."""
-        move = random.choice(list(VALID_MOVES))
-        print(f"👩 Alice chose: {move.upper()}")
+        move = _MOVES[random.randrange(len(_MOVES))]
+        log.info(f"👩 Alice chose: {move.upper()}")
         return move
     
-    def play_game(self):
-        """Play a single game with Bob."""
-        print(f"\n{'='*60}")
-        print(f"🎮 Connecting to Bob's server at {self.server_host}:{self.server_port}")
-        print(f"{'='*60}\n")
+    def play_game(self, sock):
+        """
+        Play a single game with Bob.
         
+        Args:
+            sock: Socket connected to Bob's server, shared by every game of the session
+        """
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.connect((self.server_host, self.server_port))
-                print(f"✅ Connected to Bob!\n")
-                
-                # Phase 1: Alice chooses and commits
-                print("📤 Phase 1: Creating commitment...")
-                alice_move = self.choose_move()
-                alice_nonce = self.commitment_scheme.generate_nonce()
-                alice_commitment = self.commitment_scheme.commit(alice_move, alice_nonce)
-                
-                print(f"✅ Generated commitment: {alice_commitment[:16]}...")
-                print(f"   (This hides Alice's move: {alice_move.upper()})")
-                
-                send_message(sock, MSG_COMMIT, commitment=alice_commitment)
-                print(f"✅ Sent commitment to Bob\n")
-                
-                # Phase 2: Receive Bob's move
-                print("📥 Phase 2: Waiting for Bob's move...")
-                msg = receive_message(sock)
-                
-                if msg['type'] == MSG_ERROR:
-                    print(f"❌ Error from Bob: {msg['data']['message']}")
-                    return
-                
-                if msg['type'] != MSG_MOVE:
-                    print(f"❌ Unexpected message type: {msg['type']}")
-                    return
-                
-                bob_move = msg['data']['move']
-                print(f"✅ Bob played: {bob_move.upper()}")
-                print(f"   (Bob chose without knowing Alice's move!)\n")
-                
-                # Phase 3: Alice reveals
-                print("📤 Phase 3: Revealing move and nonce...")
-                time.sleep(0.5)
-                
-                send_message(sock, MSG_REVEAL, move=alice_move, nonce=alice_nonce)
-                print(f"✅ Revealed: {alice_move.upper()}")
-                print(f"   Nonce: {alice_nonce[:16]}...\n")
-                
-                # Phase 4: Receive result
-                print("📥 Phase 4: Waiting for result...")
-                msg = receive_message(sock)
-                
-                if msg['type'] == MSG_ERROR:
-                    print(f"❌ Error from Bob: {msg['data']['message']}")
-                    return
-                
-                if msg['type'] != MSG_RESULT:
-                    print(f"❌ Unexpected message type: {msg['type']}")
-                    return
-                
-                # Display result
-                winner = msg['data']['winner']
-                result_msg = msg['data']['message']
-                
-                print(f"\n{'='*60}")
-                print(f"📊 GAME RESULT")
-                print(f"{'='*60}")
-                print(f"Alice played: {alice_move.upper()}")
-                print(f"Bob played:   {bob_move.upper()}")
-                print(f"\n{result_msg}")
-                print(f"{'='*60}\n")
-                
-        except ConnectionRefusedError:
-            print(f"❌ Cannot connect to Bob at {self.server_host}:{self.server_port}")
-            print(f"   Make sure Bob's server is running!")
+            # Phase 1: Alice chooses and commits
+            log.info("📤 Phase 1: Creating commitment...")
+            alice_move = self.choose_move()
+            alice_nonce = CommitmentScheme.generate_nonce()
+            alice_commitment = CommitmentScheme.commit(alice_move, alice_nonce)
+            
+            log.info(f"✅ Generated commitment: {alice_commitment[:16]}...")
+            log.info(f"   (This hides Alice's move: {alice_move.upper()})")
+            
+            send_message(sock, MSG_COMMIT, commitment=alice_commitment)
+            log.info(f"✅ Sent commitment to Bob\n")
+            
+            # Phase 2: Receive Bob's move
+            log.info("📥 Phase 2: Waiting for Bob's move...")
+            msg = receive_message(sock)
+            
+            if msg['type'] == MSG_ERROR:
+                log.error(f"❌ Error from Bob: {msg['data']['message']}")
+                return
+            
+            if msg['type'] != MSG_MOVE:
+                log.error(f"❌ Unexpected message type: {msg['type']}")
+                return
+            
+            bob_move = msg['data']['move']
+            log.info(f"✅ Bob played: {bob_move.upper()}")
+            log.info(f"   (Bob chose without knowing Alice's move!)\n")
+            
+            # Phase 3: Alice reveals
+            log.info("📤 Phase 3: Revealing move and nonce...")
+            
+            send_message(sock, MSG_REVEAL, move=alice_move, nonce=alice_nonce)
+            log.info(f"✅ Revealed: {alice_move.upper()}")
+            log.info(f"   Nonce: {alice_nonce[:16]}...\n")
+            
+            # Phase 4: Receive result
+            log.info("📥 Phase 4: Waiting for result...")
+            msg = receive_message(sock)
+            
+            if msg['type'] == MSG_ERROR:
+                log.error(f"❌ Error from Bob: {msg['data']['message']}")
+                return
+            
+            if msg['type'] != MSG_RESULT:
+                log.error(f"❌ Unexpected message type: {msg['type']}")
+                return
+            
+            # Display result
+            winner = msg['data']['winner']
+            result_msg = msg['data']['message']
+            
+            log.info(f"\n{'='*60}")
+            log.info(f"📊 GAME RESULT")
+            log.info(f"{'='*60}")
+            log.info(f"Alice played: {alice_move.upper()}")
+            log.info(f"Bob played:   {bob_move.upper()}")
+            log.info(f"\n{result_msg}")
+            log.info(f"{'='*60}\n")
+            
+        except ConnectionError:
+            raise
         except Exception as e:
-            print(f"❌ Error during game: {e}")
+            log.error(f"❌ Error during game: {e}")
     
-    def run(self, num_games=1):
+    def run(self, num_games=1, inter_game_delay=0):
         """
         Run multiple games.
         
         Args:
             num_games: Number of games to play
+            inter_game_delay: Seconds to pause between games (0 disables the pause)
         """
-        print(f"\n{'='*60}")
-        print(f"🎲 Alice's Rock-Paper-Scissors Client")
-        print(f"{'='*60}")
-        print(f"🎯 Will play {num_games} game(s) with Bob")
-        print(f"{'='*60}\n")
+        log.info(f"\n{'='*60}")
+        log.info(f"🎲 Alice's Rock-Paper-Scissors Client")
+        log.info(f"{'='*60}")
+        log.info(f"🎯 Will play {num_games} game(s) with Bob")
+        log.info(f"{'='*60}\n")
         
-        for game_num in range(1, num_games + 1):
-            if num_games > 1:
-                print(f"\n{'🎮'*20}")
-                print(f"Game {game_num}/{num_games}")
-                print(f"{'🎮'*20}\n")
-            
-            self.play_game()
-            
-            if game_num < num_games:
-                print(f"\n⏳ Waiting 3 seconds before next game...\n")
-                time.sleep(3)
+        log.info(f"\n{'='*60}")
+        log.info(f"🎮 Connecting to Bob's server at {self.server_host}:{self.server_port}")
+        log.info(f"{'='*60}\n")
         
-        print(f"\n👋 All games completed!\n")
+        try:
+            with connect_to_server(self.server_host, self.server_port,
+                                   wait=self.connect_timeout) as sock:
+                log.info(f"✅ Connected to Bob!\n")
+                
+                # One connection carries the whole session
+                for game_num in range(1, num_games + 1):
+                    if num_games > 1:
+                        log.info(f"\n{'🎮'*20}")
+                        log.info(f"Game {game_num}/{num_games}")
+                        log.info(f"{'🎮'*20}\n")
+                    
+                    self.play_game(sock)
+                    
+                    if game_num < num_games and inter_game_delay > 0:
+                        log.info(f"\n⏳ Waiting {inter_game_delay} seconds before next game...\n")
+                        time.sleep(inter_game_delay)
+        except (ConnectionRefusedError, socket.gaierror):
+            # Refused, or Bob's host name never resolved before the startup deadline
+            log.error(f"❌ Cannot connect to Bob at {self.server_host}:{self.server_port}")
+            log.error(f"   Make sure Bob's server is running!")
+            return
+        except ConnectionError as e:
+            log.error(f"❌ Connection to Bob lost: {e}")
+            return
+        
+        log.info(f"\n👋 All games completed!\n")
 
 
 def main():
     """Main entry point."""
+    setup_logging()
+    
     # Get configuration from environment variables (for Docker)
     server_host = os.environ.get('BOB_HOST', 'bob')
     server_port = int(os.environ.get('BOB_PORT', 5555))
     num_games = int(os.environ.get('NUM_GAMES', 3))
+    inter_game_delay = float(os.environ.get('INTER_GAME_DELAY', 0))
     
-    # Add delay to ensure Bob's server is ready
-    startup_delay = int(os.environ.get('STARTUP_DELAY', 2))
-    if startup_delay > 0:
-        print(f"⏳ Waiting {startup_delay} seconds for Bob's server to start...")
-        time.sleep(startup_delay)
+    # Longest time to keep retrying while Bob's server starts up; no fixed sleep
+    startup_delay = float(os.environ.get('STARTUP_DELAY', 2))
     
-    client = AliceClient(server_host=server_host, server_port=server_port)
+    client = AliceClient(server_host=server_host, server_port=server_port,
+                         connect_timeout=startup_delay)
     
     try:
-        client.run(num_games=num_games)
+        client.run(num_games=num_games, inter_game_delay=inter_game_delay)
     except KeyboardInterrupt:
-        print("\n\n👋 Client shutting down...")
+        log.info("\n\n👋 Client shutting down...")
         sys.exit(0)
 
 
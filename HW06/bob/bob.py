@@ -11,11 +11,12 @@ Protocol Flow (Bob's perspective):
 5. Verify commitment and determine winner
 """
 
+import logging
 import socket
 import sys
 import os
 import random
-import time
+import signal
 
 # Add shared directory to path
 sys.path.insert(0, '/app/shared')
@@ -23,9 +24,14 @@ sys.path.insert(0, '/app/shared')
 from protocol import (
     CommitmentScheme, GameLogic, VALID_MOVES,
     MSG_COMMIT, MSG_MOVE, MSG_REVEAL, MSG_RESULT, MSG_ERROR,
-    send_message, receive_message
+    send_message, receive_message, setup_logging, flush_logging
 )
 
+log = logging.getLogger(__name__)
+
+# Fixed-order move list, so choose_move indexes it instead of copying the set each call
+_MOVES = tuple(sorted(VALID_MOVES))
+
 
 class BobServer:
     """Bob's server implementation."""
@@ -33,13 +39,11 @@ class BobServer:
     def __init__(self, host='0.0.0.0', port=5555):
         self.host = host
         self.port = port
-        self.commitment_scheme = CommitmentScheme()
-        self.game_logic = GameLogic()
     
     def choose_move(self):
         """Bob randomly chooses a move."""
-        move = random.choice(list(VALID_MOVES))
-        print(f"🤖 Bob chose: {move.upper()}")
+        move = _MOVES[random.randrange(len(_MOVES))]
+        log.info(f"🤖 Bob chose: {move.upper()}")
         return move
     
     def handle_game(self, conn, addr):
@@ -50,13 +54,13 @@ class BobServer:
             conn: Socket connection
             addr: Client address
         """
-        print(f"\n{'='*60}")
-        print(f"🎮 New game started with {addr}")
-        print(f"{'='*60}\n")
+        log.info(f"\n{'='*60}")
+        log.info(f"🎮 New game started with {addr}")
+        log.info(f"{'='*60}\n")
         
         try:
             # Phase 1: Receive Alice's commitment
-            print("📥 Phase 1: Waiting for Alice's commitment...")
+            log.info("📥 Phase 1: Waiting for Alice's commitment...")
             msg = receive_message(conn)
             
             if msg['type'] != MSG_COMMIT:
@@ -64,19 +68,26 @@ class BobServer:
                 return
             
             alice_commitment = msg['data']['commitment']
-            print(f"✅ Received commitment: {alice_commitment[:16]}...")
-            print(f"   (Bob cannot determine Alice's move from this hash)")
+            
+            # Decode once on receipt; verification then works on the raw 32-byte digest
+            try:
+                alice_digest = bytes.fromhex(alice_commitment)
+            except (TypeError, ValueError):
+                send_message(conn, MSG_ERROR, message="Malformed commitment")
+                return
+            
+            log.info(f"✅ Received commitment: {alice_commitment[:16]}...")
+            log.info(f"   (Bob cannot determine Alice's move from this hash)")
             
             # Phase 2: Bob chooses his move and sends it
-            print(f"\n📤 Phase 2: Bob choosing move...")
-            time.sleep(0.5)  # Simulate thinking time
+            log.info(f"\n📤 Phase 2: Bob choosing move...")
             bob_move = self.choose_move()
             
             send_message(conn, MSG_MOVE, move=bob_move)
-            print(f"✅ Sent move to Alice: {bob_move.upper()}")
+            log.info(f"✅ Sent move to Alice: {bob_move.upper()}")
             
             # Phase 3: Receive Alice's reveal
-            print(f"\n📥 Phase 3: Waiting for Alice's reveal...")
+            log.info(f"\n📥 Phase 3: Waiting for Alice's reveal...")
             msg = receive_message(conn)
             
             if msg['type'] != MSG_REVEAL:
@@ -86,34 +97,34 @@ class BobServer:
             alice_move = msg['data']['move']
             alice_nonce = msg['data']['nonce']
             
-            print(f"✅ Alice revealed: {alice_move.upper()}")
-            print(f"   Nonce: {alice_nonce[:16]}...")
+            log.info(f"✅ Alice revealed: {alice_move.upper()}")
+            log.info(f"   Nonce: {alice_nonce[:16]}...")
             
             # Phase 4: Verify commitment
-            print(f"\n🔍 Phase 4: Verifying Alice's commitment...")
+            log.info(f"\n🔍 Phase 4: Verifying Alice's commitment...")
             
-            if not self.game_logic.is_valid_move(alice_move):
+            if not GameLogic.is_valid_move(alice_move):
                 send_message(conn, MSG_ERROR, message=f"Invalid move: {alice_move}")
-                print(f"❌ Invalid move from Alice: {alice_move}")
+                log.error(f"❌ Invalid move from Alice: {alice_move}")
                 return
             
-            is_valid = self.commitment_scheme.verify(
-                alice_commitment, alice_move, alice_nonce
+            is_valid, computed_digest = CommitmentScheme.compute_and_verify(
+                alice_digest, alice_move, alice_nonce
             )
             
             if not is_valid:
                 send_message(conn, MSG_ERROR, message="Commitment verification failed! Cheating detected!")
-                print(f"❌ CHEATING DETECTED! Commitment doesn't match revealed values!")
-                print(f"   Expected commitment: {alice_commitment}")
-                print(f"   Computed commitment: {self.commitment_scheme.commit(alice_move, alice_nonce)}")
+                log.error(f"❌ CHEATING DETECTED! Commitment doesn't match revealed values!")
+                log.error(f"   Expected commitment: {alice_commitment}")
+                log.error(f"   Computed commitment: {computed_digest.hex()}")
                 return
             
-            print(f"✅ Commitment verified! Alice didn't cheat.")
+            log.info(f"✅ Commitment verified! Alice didn't cheat.")
             
             # Phase 5: Determine winner
-            print(f"\n🏆 Determining winner...")
-            winner = self.game_logic.determine_winner(alice_move, bob_move)
-            result_msg = self.game_logic.get_result_message(winner, alice_move, bob_move)
+            log.info(f"\n🏆 Determining winner...")
+            winner = GameLogic.determine_winner(alice_move, bob_move)
+            result_msg = GameLogic.get_result_message(winner, alice_move, bob_move)
             
             # Send result to Alice
             send_message(conn, MSG_RESULT, 
@@ -122,20 +133,25 @@ class BobServer:
                         bob_move=bob_move,
                         message=result_msg)
             
-            print(f"\n{'='*60}")
-            print(f"📊 GAME RESULT")
-            print(f"{'='*60}")
-            print(f"Alice played: {alice_move.upper()}")
-            print(f"Bob played:   {bob_move.upper()}")
-            print(f"\n{result_msg}")
-            print(f"{'='*60}\n")
+            log.info(f"\n{'='*60}")
+            log.info(f"📊 GAME RESULT")
+            log.info(f"{'='*60}")
+            log.info(f"Alice played: {alice_move.upper()}")
+            log.info(f"Bob played:   {bob_move.upper()}")
+            log.info(f"\n{result_msg}")
+            log.info(f"{'='*60}\n")
             
+        except ConnectionError:
+            raise
         except Exception as e:
-            print(f"❌ Error during game: {e}")
+            log.error(f"❌ Error during game: {e}")
             try:
                 send_message(conn, MSG_ERROR, message=str(e))
             except:
                 pass
+        finally:
+            # Show each finished game right away instead of waiting for the buffer to fill
+            flush_logging()
     
     def run(self):
         """Start the server and listen for connections."""
@@ -144,35 +160,47 @@ class BobServer:
             server_socket.bind((self.host, self.port))
             server_socket.listen(1)
             
-            print(f"\n{'='*60}")
-            print(f"🎲 Bob's Rock-Paper-Scissors Server")
-            print(f"{'='*60}")
-            print(f"📡 Listening on {self.host}:{self.port}")
-            print(f"⏳ Waiting for Alice to connect...")
-            print(f"{'='*60}\n")
+            log.info(f"\n{'='*60}")
+            log.info(f"🎲 Bob's Rock-Paper-Scissors Server")
+            log.info(f"{'='*60}")
+            log.info(f"📡 Listening on {self.host}:{self.port}")
+            log.info(f"⏳ Waiting for Alice to connect...")
+            log.info(f"{'='*60}\n")
             
             while True:
                 conn, addr = server_socket.accept()
                 with conn:
-                    self.handle_game(conn, addr)
+                    # Commit/reveal messages are tiny: send each one immediately instead of batching
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    
+                    # Alice plays all her games over this connection, then closes it
+                    try:
+                        while True:
+                            self.handle_game(conn, addr)
+                    except ConnectionError:
+                        log.info(f"👋 Alice ({addr}) disconnected")
                 
-                # Ask if we want to play again (in Docker, we'll just exit after one game)
-                print(f"\n⏳ Ready for another game...\n")
-                time.sleep(2)
+                log.info(f"\n⏳ Ready for another game...\n")
 
 
 def main():
     """Main entry point."""
+    setup_logging()
+    
     # Get configuration from environment variables (for Docker)
     host = os.environ.get('BOB_HOST', '0.0.0.0')
     port = int(os.environ.get('BOB_PORT', 5555))
     
     server = BobServer(host=host, port=port)
     
+    # The server runs until stopped: treat SIGTERM (docker stop) like Ctrl-C so the
+    # shutdown path runs and buffered log records are flushed
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    
     try:
         server.run()
     except KeyboardInterrupt:
-        print("\n\n👋 Server shutting down...")
+        log.info("\n\n👋 Server shutting down...")
         sys.exit(0)
 
 
@@ -4,8 +4,21 @@ Implements a cryptographically secure commit-reveal scheme to prevent cheating.
 """
 
 import hashlib
+import hmac
 import secrets
+import socket
 import json
+import logging
+import logging.handlers
+import os
+import struct
+import sys
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Game moves
 ROCK = "rock"
@@ -13,6 +26,9 @@ PAPER = "paper"
 SCISSORS = "scissors"
 VALID_MOVES = {ROCK, PAPER, SCISSORS}
 
+# Cyclic move order: every move beats the previous one (PAPER > ROCK, SCISSORS > PAPER, ROCK > SCISSORS)
+_MOVE_ID = {ROCK: 0, PAPER: 1, SCISSORS: 2}
+
 # Protocol message types
 MSG_COMMIT = "COMMIT"
 MSG_MOVE = "MOVE"
@@ -21,6 +37,31 @@ MSG_RESULT = "RESULT"
 MSG_ERROR = "ERROR"
 
 
+# Empty OpenSSL-backed SHA-256 context, built once: copying it skips the digest lookup per commit
+_SHA256_BASE = hashlib.sha256()
+
+
+def _commitment_digest(value, nonce):
+    """Raw SHA-256 digest of value || '||' || nonce; bytes inputs are hashed as-is."""
+    # Copy the prebuilt context and feed the fragments directly, no joined string
+    h = _SHA256_BASE.copy()
+    h.update(value if isinstance(value, bytes) else str(value).encode('utf-8'))
+    h.update(b'||')
+    h.update(nonce if isinstance(nonce, bytes) else nonce.encode('utf-8'))
+    return h.digest()
+
+
+def _digest_matches(commitment, digest):
+    """Constant-time check of a raw or hex commitment against digest; malformed hex never matches."""
+    if isinstance(commitment, bytes):
+        return hmac.compare_digest(commitment, digest)
+    try:
+        committed = bytes.fromhex(commitment)
+    except (TypeError, ValueError):
+        return False
+    return hmac.compare_digest(committed, digest)
+
+
 class CommitmentScheme:
     """
     Implements a cryptographic commitment scheme using SHA-256.
@@ -41,14 +82,27 @@ class CommitmentScheme:
         Create a commitment to a value using SHA-256.
         
         Args:
-            value: The value to commit to (e.g., "rock")
-            nonce: A random nonce for security
+            value: The value to commit to (e.g., "rock"), or its UTF-8 bytes
+            nonce: A random nonce for security (hex string or its bytes)
             
         Returns:
             The commitment (SHA-256 hash as hex string)
         """
-        data = f"{value}||{nonce}".encode('utf-8')
-        return hashlib.sha256(data).hexdigest()
+        return _commitment_digest(value, nonce).hex()
+    
+    @staticmethod
+    def commit_digest(value, nonce):
+        """
+        Create a commitment as raw bytes; commit() is its hex form, used on the wire.
+        
+        Args:
+            value: The value to commit to, or its UTF-8 bytes
+            nonce: A random nonce for security (hex string or its bytes)
+            
+        Returns:
+            The 32-byte SHA-256 digest
+        """
+        return _commitment_digest(value, nonce)
     
     @staticmethod
     def verify(commitment, value, nonce):
@@ -56,15 +110,45 @@ class CommitmentScheme:
         Verify that a revealed value matches the original commitment.
         
         Args:
-            commitment: The original commitment hash
+            commitment: The original commitment, as raw digest bytes or hex string
             value: The revealed value
             nonce: The revealed nonce
             
         Returns:
             True if verification succeeds, False otherwise
         """
-        expected_commitment = CommitmentScheme.commit(value, nonce)
-        return commitment == expected_commitment
+        return _digest_matches(commitment, _commitment_digest(value, nonce))
+    
+    @staticmethod
+    def compute_and_verify(commitment, value, nonce):
+        """
+        Verify a reveal and also return the digest it recomputed, so a failure
+        can be reported without hashing the reveal a second time.
+        
+        Args:
+            commitment: The original commitment, as raw digest bytes or hex string
+            value: The revealed value
+            nonce: The revealed nonce
+            
+        Returns:
+            Tuple (is_valid, computed_digest) with the digest as raw bytes
+        """
+        computed = _commitment_digest(value, nonce)
+        return _digest_matches(commitment, computed), computed
+    
+    @staticmethod
+    def verify_batch(reveals):
+        """
+        Verify many revealed commitments at once (e.g. when auditing a match log).
+        
+        Args:
+            reveals: Iterable of (commitment, value, nonce) tuples; commitments as bytes or hex
+            
+        Returns:
+            List of booleans, one per tuple, in input order
+        """
+        return [_digest_matches(commitment, _commitment_digest(value, nonce))
+                for commitment, value, nonce in reveals]
 
 
 class GameLogic:
@@ -87,19 +171,9 @@ class GameLogic:
         Returns:
             1 if player 1 wins, 2 if player 2 wins, 0 for tie
         """
-        if move1 == move2:
-            return 0  # Tie
-        
-        winning_combinations = {
-            (ROCK, SCISSORS),
-            (SCISSORS, PAPER),
-            (PAPER, ROCK)
-        }
-        
-        if (move1, move2) in winning_combinations:
-            return 1  # Player 1 wins
-        else:
-            return 2  # Player 2 wins
+        # Each move beats the one just before it in cyclic order, so the
+        # difference mod 3 is directly 0 (tie), 1 (player 1) or 2 (player 2)
+        return (_MOVE_ID[move1] - _MOVE_ID[move2]) % 3
     
     @staticmethod
     def get_result_message(winner, alice_move, bob_move):
@@ -112,6 +186,34 @@ class GameLogic:
             return f"BOB WINS! {bob_move} beats {alice_move}"
 
 
+def _message_prefix(msg_type):
+    """Encoded '{"type":<msg_type>,"data":' head of a protocol message."""
+    return b'{"type":%s,"data":' % json.dumps(msg_type).encode('utf-8')
+
+
+# Heads of every known message type, encoded once: only the data part is serialized per message
+_MESSAGE_PREFIXES = {
+    msg_type: _message_prefix(msg_type)
+    for msg_type in (MSG_COMMIT, MSG_MOVE, MSG_REVEAL, MSG_RESULT, MSG_ERROR)
+}
+
+
+def _encode_message(msg_type, data):
+    """Serialize a protocol message to UTF-8 JSON bytes (orjson when installed)."""
+    prefix = _MESSAGE_PREFIXES.get(msg_type)
+    if prefix is None:
+        prefix = _message_prefix(msg_type)
+    if orjson is not None:
+        body = orjson.dumps(data)
+    else:
+        body = json.dumps(data).encode('utf-8')
+    return prefix + body + b'}'
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so parse() handles both the same way
+_decode_json = orjson.loads if orjson is not None else json.loads
+
+
 class ProtocolMessage:
     """Helper class for creating and parsing protocol messages."""
     
@@ -127,8 +229,7 @@ class ProtocolMessage:
         Returns:
             JSON-encoded message string
         """
-        message = {"type": msg_type, "data": kwargs}
-        return json.dumps(message)
+        return _encode_message(msg_type, kwargs).decode('utf-8')
     
     @staticmethod
     def parse(message_str):
@@ -136,13 +237,13 @@ class ProtocolMessage:
         Parse a protocol message.
         
         Args:
-            message_str: JSON-encoded message string
+            message_str: JSON-encoded message (string or UTF-8 bytes)
             
         Returns:
             Dictionary with 'type' and 'data' keys
         """
         try:
-            message = json.loads(message_str)
+            message = _decode_json(message_str)
             if "type" not in message or "data" not in message:
                 raise ValueError("Invalid message format")
             return message
@@ -150,6 +251,71 @@ class ProtocolMessage:
             raise ValueError(f"Failed to parse message: {e}")
 
 
+def setup_logging(verbose=None):
+    """
+    Route game output through a buffered logging handler.
+    
+    Records are collected in memory and written to stdout in batches (errors are written
+    immediately, everything left is flushed at exit), instead of one flushed write per line.
+    
+    Args:
+        verbose: Show the step-by-step game log; defaults to the VERBOSE environment variable.
+            When off, only errors are shown.
+    """
+    if verbose is None:
+        verbose = os.environ.get('VERBOSE', '0') not in ('', '0')
+    
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter('%(message)s'))
+    handler = logging.handlers.MemoryHandler(
+        capacity=64, flushLevel=logging.ERROR, target=stream
+    )
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.WARNING,
+        handlers=[handler]
+    )
+
+
+def flush_logging():
+    """Write out any buffered log records now, e.g. once a game is over."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+def connect_to_server(host, port, wait=0.0, retry_interval=0.1):
+    """
+    Open a TCP connection, retrying while the server is not accepting yet.
+    
+    Args:
+        host: Server host name or address
+        port: Server port
+        wait: Seconds to keep retrying before giving up (0 tries once)
+        retry_interval: Seconds between attempts
+        
+    Returns:
+        Connected socket with TCP_NODELAY set
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except (ConnectionRefusedError, socket.gaierror):
+            # The server (or its DNS name, under Docker) may simply not be up yet
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(retry_interval)
+    
+    # Commit/reveal messages are tiny: send each one immediately instead of batching
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+# Each message is framed as a 4-byte big-endian payload length followed by the JSON payload
+_FRAME_HEADER = struct.Struct('>I')
+MAX_MESSAGE_SIZE = 1 << 20
+
+
 def send_message(sock, msg_type, **kwargs):
     """
     Send a protocol message over a socket.
@@ -159,8 +325,30 @@ def send_message(sock, msg_type, **kwargs):
         msg_type: Message type
         **kwargs: Message data
     """
-    message = ProtocolMessage.create(msg_type, **kwargs)
-    sock.sendall(message.encode('utf-8') + b'\n')
+    payload = _encode_message(msg_type, kwargs)
+    sock.sendall(_FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, num_bytes):
+    """
+    Read exactly num_bytes from a socket into a preallocated buffer.
+    
+    Args:
+        sock: Socket object
+        num_bytes: Number of bytes to read
+        
+    Returns:
+        bytearray holding the received bytes
+    """
+    buffer = bytearray(num_bytes)
+    view = memoryview(buffer)
+    received = 0
+    while received < num_bytes:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("Connection closed")
+        received += n
+    return buffer
 
 
 def receive_message(sock):
@@ -173,15 +361,11 @@ def receive_message(sock):
     Returns:
         Parsed message dictionary
     """
-    # Read until newline
-    data = b''
-    while True:
-        chunk = sock.recv(1)
-        if not chunk:
-            raise ConnectionError("Connection closed")
-        if chunk == b'\n':
-            break
-        data += chunk
+    # The length prefix says exactly how much to read, so no delimiter scan is needed
+    (length,) = _FRAME_HEADER.unpack(_recv_exact(sock, _FRAME_HEADER.size))
+    if length > MAX_MESSAGE_SIZE:
+        # The payload is still in the stream, so the framing is lost: drop the connection
+        raise ConnectionError(f"Message too large: {length} bytes")
     
-    message_str = data.decode('utf-8')
-    return ProtocolMessage.parse(message_str)
+    # Both JSON backends decode UTF-8 bytes directly
+    return ProtocolMessage.parse(bytes(_recv_exact(sock, length)))
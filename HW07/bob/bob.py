@@ -3,7 +3,7 @@
 Bob's Server - Dice Game
 Implements the server side of the commit-reveal protocol for dice games.
 
-Protocol Flow (Bob's perspective):
+Protocol Flow (Bob's perspective, per connected Alice; matches run concurrently):
 1. Listen for Alice's connection
 2. Receive Alice's commitment (hash of sum)
 3. Roll k dice and send sum to Alice
@@ -13,10 +13,12 @@ Protocol Flow (Bob's perspective):
 7. Send match result
 """
 
+import asyncio
+import logging
+import signal
 import socket
 import sys
 import os
-import time
 
 # Add shared directory to path
 sys.path.insert(0, '/app/shared')
@@ -24,9 +26,11 @@ sys.path.insert(0, '/app/shared')
 from protocol import (
     CommitmentScheme, DiceLogic,
     MSG_COMMIT, MSG_RESULT, MSG_REVEAL, MSG_MATCH_RESULT, MSG_ERROR,
-    send_message, receive_message
+    send_message_async, receive_message_async, setup_logging, flush_logging
 )
 
+log = logging.getLogger(__name__)
+
 
 class BobServer:
     """Bob's server implementation."""
@@ -34,197 +38,237 @@ class BobServer:
     def __init__(self, host='0.0.0.0', port=5555):
         self.host = host
         self.port = port
-        self.commitment_scheme = CommitmentScheme()
-        self.dice_logic = DiceLogic()
     
-    def handle_game(self, conn, addr, game_num):
+    async def handle_game(self, reader, writer, addr, game_num):
         """
         Handle a single game session with Alice.
         
         Args:
-            conn: Socket connection
+            reader: asyncio stream reading from Alice
+            writer: asyncio stream writing to Alice
             addr: Client address
             game_num: Game number in match
             
         Returns:
             Tuple (alice_sum, bob_sum, winner) or None on error
         """
-        print(f"\n{'='*60}")
-        print(f"🎮 Game {game_num} with {addr}")
-        print(f"{'='*60}\n")
+        log.info(f"\n{'='*60}")
+        log.info(f"🎮 Game {game_num} with {addr}")
+        log.info(f"{'='*60}\n")
         
         try:
             # Phase 1: Receive Alice's commitment
-            print("📥 Phase 1: Waiting for Alice's commitment...")
-            msg = receive_message(conn)
+            log.info("📥 Phase 1: Waiting for Alice's commitment...")
+            msg = await receive_message_async(reader)
             
             if msg['type'] != MSG_COMMIT:
-                send_message(conn, MSG_ERROR, message="Expected COMMIT message")
+                await send_message_async(writer, MSG_ERROR, message="Expected COMMIT message")
                 return None
             
             alice_commitment = msg['data']['commitment']
             num_dice = msg['data']['num_dice']
             
-            print(f"✅ Received commitment: {alice_commitment[:16]}...")
-            print(f"   Number of dice: {num_dice}")
-            print(f"   (Bob cannot determine Alice's sum from this hash)")
+            # Decode once on receipt; verification then works on the raw 32-byte digest
+            try:
+                alice_digest = bytes.fromhex(alice_commitment)
+            except (TypeError, ValueError):
+                await send_message_async(writer, MSG_ERROR, message="Malformed commitment")
+                return None
+            
+            if not DiceLogic.is_valid_num_dice(num_dice):
+                await send_message_async(writer, MSG_ERROR,
+                                         message=f"Invalid number of dice: {num_dice}")
+                log.error(f"❌ Invalid number of dice from Alice: {num_dice}")
+                return None
+            
+            log.info(f"✅ Received commitment: {alice_commitment[:16]}...")
+            log.info(f"   Number of dice: {num_dice}")
+            log.info(f"   (Bob cannot determine Alice's sum from this hash)")
             
             # Phase 2: Bob rolls dice and sends result
-            print(f"\n📤 Phase 2: Bob rolling {num_dice} dice...")
-            time.sleep(0.3)  # Simulate thinking time
+            log.info(f"\n📤 Phase 2: Bob rolling {num_dice} dice...")
             
-            bob_dice = self.dice_logic.roll_dice(num_dice)
-            bob_sum = self.dice_logic.calculate_sum(bob_dice)
+            bob_dice = DiceLogic.roll_dice(num_dice)
+            bob_sum = DiceLogic.calculate_sum(bob_dice)
             
-            print(f"🎲 Bob rolled: {bob_dice}")
-            print(f"📊 Bob's sum: {bob_sum}")
+            log.info(f"🎲 Bob rolled: {bob_dice}")
+            log.info(f"📊 Bob's sum: {bob_sum}")
             
-            send_message(conn, MSG_RESULT, 
-                        bob_sum=bob_sum,
-                        bob_dice=bob_dice)
-            print(f"✅ Sent result to Alice: {bob_dice} = {bob_sum}")
+            await send_message_async(writer, MSG_RESULT, 
+                                     bob_sum=bob_sum,
+                                     bob_dice=bob_dice)
+            log.info(f"✅ Sent result to Alice: {bob_dice} = {bob_sum}")
             
             # Phase 3: Receive Alice's reveal
-            print(f"\n📥 Phase 3: Waiting for Alice's reveal...")
-            msg = receive_message(conn)
+            log.info(f"\n📥 Phase 3: Waiting for Alice's reveal...")
+            msg = await receive_message_async(reader)
             
             if msg['type'] != MSG_REVEAL:
-                send_message(conn, MSG_ERROR, message="Expected REVEAL message")
+                await send_message_async(writer, MSG_ERROR, message="Expected REVEAL message")
                 return None
             
             alice_sum = msg['data']['alice_sum']
-            alice_dice = msg['data']['alice_dice']
             alice_nonce = msg['data']['nonce']
             
-            print(f"✅ Alice revealed: {alice_dice} = {alice_sum}")
-            print(f"   Nonce: {alice_nonce[:16]}...")
+            log.info(f"✅ Alice revealed sum: {alice_sum}")
+            log.info(f"   Nonce: {alice_nonce[:16]}...")
             
             # Phase 4: Verify commitment
-            print(f"\n🔍 Phase 4: Verifying Alice's commitment...")
-            
-            # Verify sum matches dice
-            expected_sum = sum(alice_dice)
-            if alice_sum != expected_sum:
-                send_message(conn, MSG_ERROR, 
-                           message=f"Invalid sum! Dice {alice_dice} != sum {alice_sum}")
-                print(f"❌ Invalid sum from Alice!")
-                return None
+            log.info(f"\n🔍 Phase 4: Verifying Alice's commitment...")
             
             # Verify commitment
-            is_valid = self.commitment_scheme.verify(
-                alice_commitment, str(alice_sum), alice_nonce
+            is_valid, computed_digest = CommitmentScheme.compute_and_verify(
+                alice_digest, str(alice_sum), alice_nonce
             )
             
             if not is_valid:
-                send_message(conn, MSG_ERROR, 
-                           message="Commitment verification failed! Cheating detected!")
-                print(f"❌ CHEATING DETECTED! Commitment doesn't match!")
-                print(f"   Expected: {alice_commitment}")
-                print(f"   Computed: {self.commitment_scheme.commit(str(alice_sum), alice_nonce)}")
+                await send_message_async(writer, MSG_ERROR, 
+                                         message="Commitment verification failed! Cheating detected!")
+                log.error(f"❌ CHEATING DETECTED! Commitment doesn't match!")
+                log.error(f"   Expected: {alice_commitment}")
+                log.error(f"   Computed: {computed_digest.hex()}")
+                return None
+            
+            # The commitment binds the sum but not the dice, so the sum itself must be reachable
+            if not DiceLogic.is_valid_sum(alice_sum, num_dice):
+                await send_message_async(writer, MSG_ERROR,
+                                         message=f"Invalid sum for {num_dice} dice! Cheating detected!")
+                log.error(f"❌ CHEATING DETECTED! Sum {alice_sum} is impossible with {num_dice} dice!")
                 return None
             
-            print(f"✅ Commitment verified! Alice didn't cheat.")
+            log.info(f"✅ Commitment verified! Alice didn't cheat.")
             
             # Phase 5: Determine winner
-            print(f"\n🏆 Determining winner...")
-            winner = self.dice_logic.determine_winner(alice_sum, bob_sum)
-            result_msg = self.dice_logic.get_result_message(winner, alice_sum, bob_sum)
+            log.info(f"\n🏆 Determining winner...")
+            winner = DiceLogic.determine_winner(alice_sum, bob_sum)
+            result_msg = DiceLogic.get_result_message(winner, alice_sum, bob_sum)
             
             # Send result to Alice
-            send_message(conn, MSG_MATCH_RESULT,
-                        winner=winner,
-                        alice_sum=alice_sum,
-                        alice_dice=alice_dice,
-                        bob_sum=bob_sum,
-                        bob_dice=bob_dice,
-                        message=result_msg)
-            
-            print(f"\n{'='*60}")
-            print(f"📊 GAME {game_num} RESULT")
-            print(f"{'='*60}")
-            print(f"Alice: {alice_dice} = {alice_sum}")
-            print(f"Bob:   {bob_dice} = {bob_sum}")
-            print(f"\n{result_msg}")
-            print(f"{'='*60}\n")
+            await send_message_async(writer, MSG_MATCH_RESULT,
+                                     winner=winner,
+                                     alice_sum=alice_sum,
+                                     bob_sum=bob_sum,
+                                     bob_dice=bob_dice,
+                                     message=result_msg)
+            
+            log.info(f"\n{'='*60}")
+            log.info(f"📊 GAME {game_num} RESULT")
+            log.info(f"{'='*60}")
+            log.info(f"Alice: {alice_sum}")
+            log.info(f"Bob:   {bob_dice} = {bob_sum}")
+            log.info(f"\n{result_msg}")
+            log.info(f"{'='*60}\n")
             
             return (alice_sum, bob_sum, winner)
             
+        except ConnectionError:
+            raise
         except Exception as e:
-            print(f"❌ Error during game: {e}")
+            log.error(f"❌ Error during game: {e}")
             try:
-                send_message(conn, MSG_ERROR, message=str(e))
+                await send_message_async(writer, MSG_ERROR, message=str(e))
             except:
                 pass
             return None
     
-    def run_match(self, num_games=5):
+    async def play_match(self, reader, writer, num_games):
         """
-        Run a match of multiple games.
+        Play a complete match with one connected Alice.
         
         Args:
+            reader: asyncio stream reading from Alice
+            writer: asyncio stream writing to Alice
             num_games: Number of games in the match
         """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_socket:
-            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            server_socket.bind((self.host, self.port))
-            server_socket.listen(num_games)
-            
-            print(f"\n{'='*60}")
-            print(f"🎲 Bob's Dice Game Server")
-            print(f"{'='*60}")
-            print(f"📡 Listening on {self.host}:{self.port}")
-            print(f"🎯 Match: {num_games} games")
-            print(f"⏳ Waiting for Alice to connect...")
-            print(f"{'='*60}\n")
-            
-            alice_wins = 0
-            bob_wins = 0
-            ties = 0
-            
+        addr = writer.get_extra_info('peername')
+        # Commit/reveal messages are tiny: send each one immediately instead of batching
+        writer.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        
+        alice_wins = 0
+        bob_wins = 0
+        ties = 0
+        
+        # Alice plays the whole match over this one connection
+        try:
             for game_num in range(1, num_games + 1):
-                conn, addr = server_socket.accept()
-                with conn:
-                    result = self.handle_game(conn, addr, game_num)
-                    
-                    if result is None:
-                        print(f"❌ Game {game_num} failed")
-                        continue
-                    
-                    alice_sum, bob_sum, winner = result
-                    
-                    if winner == 1:
-                        alice_wins += 1
-                    elif winner == 2:
-                        bob_wins += 1
-                    else:
-                        ties += 1
+                result = await self.handle_game(reader, writer, addr, game_num)
+                # Show each finished game right away instead of waiting for the buffer to fill
+                flush_logging()
+                
+                if result is None:
+                    log.error(f"❌ Game {game_num} with {addr} failed")
+                    continue
                 
-                if game_num < num_games:
-                    print(f"\n⏳ Ready for next game...\n")
-                    time.sleep(1)
-            
-            # Display match result
-            print(f"\n{'='*70}")
-            print(f"🏆 MATCH FINAL RESULTS")
-            print(f"{'='*70}")
-            print(f"Total games played: {num_games}")
-            print(f"Alice wins: {alice_wins}")
-            print(f"Bob wins:   {bob_wins}")
-            print(f"Ties:       {ties}")
-            print(f"")
-            
-            if alice_wins > bob_wins:
-                print(f"😔 Alice wins the match ({alice_wins}-{bob_wins})")
-            elif bob_wins > alice_wins:
-                print(f"🎉 BOB WINS THE MATCH! ({bob_wins}-{alice_wins})")
-            else:
-                print(f"🤝 MATCH TIED! ({alice_wins}-{bob_wins})")
-            
-            print(f"{'='*70}\n")
+                alice_sum, bob_sum, winner = result
+                
+                if winner == 1:
+                    alice_wins += 1
+                elif winner == 2:
+                    bob_wins += 1
+                else:
+                    ties += 1
+        except ConnectionError:
+            log.error(f"❌ Alice ({addr}) disconnected before the match finished")
+        finally:
+            writer.close()
+        
+        # Display match result
+        log.info(f"\n{'='*70}")
+        log.info(f"🏆 MATCH FINAL RESULTS ({addr})")
+        log.info(f"{'='*70}")
+        log.info(f"Total games played: {num_games}")
+        log.info(f"Alice wins: {alice_wins}")
+        log.info(f"Bob wins:   {bob_wins}")
+        log.info(f"Ties:       {ties}")
+        log.info(f"")
+        
+        if alice_wins > bob_wins:
+            log.info(f"😔 Alice wins the match ({alice_wins}-{bob_wins})")
+        elif bob_wins > alice_wins:
+            log.info(f"🎉 BOB WINS THE MATCH! ({bob_wins}-{alice_wins})")
+        else:
+            log.info(f"🤝 MATCH TIED! ({alice_wins}-{bob_wins})")
+        
+        log.info(f"{'='*70}\n")
+        flush_logging()
+    
+    async def serve(self, num_games=5):
+        """
+        Accept Alice clients and play one match with each, all concurrently.
+        
+        Args:
+            num_games: Number of games in each match
+        """
+        server = await asyncio.start_server(
+            lambda reader, writer: self.play_match(reader, writer, num_games),
+            self.host, self.port, reuse_address=True
+        )
+        
+        log.info(f"\n{'='*60}")
+        log.info(f"🎲 Bob's Dice Game Server")
+        log.info(f"{'='*60}")
+        log.info(f"📡 Listening on {self.host}:{self.port}")
+        log.info(f"🎯 Match: {num_games} games")
+        log.info(f"⏳ Waiting for Alice to connect...")
+        log.info(f"{'='*60}\n")
+        
+        async with server:
+            await server.serve_forever()
+    
+    def run_match(self, num_games=5):
+        """
+        Run the server until interrupted, serving any number of Alice clients at once.
+        
+        Args:
+            num_games: Number of games in each match
+        """
+        asyncio.run(self.serve(num_games))
 
 
 def main():
     """Main entry point."""
+    setup_logging()
+    
     # Get configuration from environment variables (for Docker)
     host = os.environ.get('BOB_HOST', '0.0.0.0')
     port = int(os.environ.get('BOB_PORT', 5555))
@@ -232,10 +276,14 @@ def main():
     
     server = BobServer(host=host, port=port)
     
+    # The server now runs until stopped: treat SIGTERM (docker stop) like Ctrl-C so the
+    # shutdown path runs and buffered log records are flushed
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    
     try:
         server.run_match(num_games=num_games)
     except KeyboardInterrupt:
-        print("\n\n👋 Server shutting down...")
+        log.info("\n\n👋 Server shutting down...")
         sys.exit(0)
 
 
@@ -3,10 +3,23 @@ Dice Game Commitment Protocol
 Implements a cryptographically secure commit-reveal scheme for dice games.
 """
 
+import asyncio
 import hashlib
+import hmac
 import secrets
+import socket
 import json
-import random
+import logging
+import logging.handlers
+import os
+import struct
+import sys
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Protocol message types
 MSG_COMMIT = "COMMIT"
@@ -15,6 +28,34 @@ MSG_REVEAL = "REVEAL"
 MSG_MATCH_RESULT = "MATCH_RESULT"
 MSG_ERROR = "ERROR"
 
+# Most dice a player may ask for: Bob rolls them synchronously on the shared event loop
+MAX_DICE = 1000
+
+
+# Empty OpenSSL-backed SHA-256 context, built once: copying it skips the digest lookup per commit
+_SHA256_BASE = hashlib.sha256()
+
+
+def _commitment_digest(value, nonce):
+    """Raw SHA-256 digest of value || '||' || nonce; bytes inputs are hashed as-is."""
+    # Copy the prebuilt context and feed the fragments directly, no joined string
+    h = _SHA256_BASE.copy()
+    h.update(value if isinstance(value, bytes) else str(value).encode('utf-8'))
+    h.update(b'||')
+    h.update(nonce if isinstance(nonce, bytes) else nonce.encode('utf-8'))
+    return h.digest()
+
+
+def _digest_matches(commitment, digest):
+    """Constant-time check of a raw or hex commitment against digest; malformed hex never matches."""
+    if isinstance(commitment, bytes):
+        return hmac.compare_digest(commitment, digest)
+    try:
+        committed = bytes.fromhex(commitment)
+    except (TypeError, ValueError):
+        return False
+    return hmac.compare_digest(committed, digest)
+
 
 class CommitmentScheme:
     """
@@ -36,14 +77,27 @@ class CommitmentScheme:
         Create a commitment to a value using SHA-256.
         
         Args:
-            value: The value to commit to (dice sum as string)
-            nonce: A random nonce for security
+            value: The value to commit to (dice sum as string), or its UTF-8 bytes
+            nonce: A random nonce for security (hex string or its bytes)
             
         Returns:
             The commitment (SHA-256 hash as hex string)
         """
-        data = f"{value}||{nonce}".encode('utf-8')
-        return hashlib.sha256(data).hexdigest()
+        return _commitment_digest(value, nonce).hex()
+    
+    @staticmethod
+    def commit_digest(value, nonce):
+        """
+        Create a commitment as raw bytes; commit() is its hex form, used on the wire.
+        
+        Args:
+            value: The value to commit to, or its UTF-8 bytes
+            nonce: A random nonce for security (hex string or its bytes)
+            
+        Returns:
+            The 32-byte SHA-256 digest
+        """
+        return _commitment_digest(value, nonce)
     
     @staticmethod
     def verify(commitment, value, nonce):
@@ -51,15 +105,72 @@ class CommitmentScheme:
         Verify that a revealed value matches the original commitment.
         
         Args:
-            commitment: The original commitment hash
+            commitment: The original commitment, as raw digest bytes or hex string
             value: The revealed value
             nonce: The revealed nonce
             
         Returns:
             True if verification succeeds, False otherwise
         """
-        expected_commitment = CommitmentScheme.commit(value, nonce)
-        return commitment == expected_commitment
+        return _digest_matches(commitment, _commitment_digest(value, nonce))
+    
+    @staticmethod
+    def compute_and_verify(commitment, value, nonce):
+        """
+        Verify a reveal and also return the digest it recomputed, so a failure
+        can be reported without hashing the reveal a second time.
+        
+        Args:
+            commitment: The original commitment, as raw digest bytes or hex string
+            value: The revealed value
+            nonce: The revealed nonce
+            
+        Returns:
+            Tuple (is_valid, computed_digest) with the digest as raw bytes
+        """
+        computed = _commitment_digest(value, nonce)
+        return _digest_matches(commitment, computed), computed
+    
+    @staticmethod
+    def verify_batch(reveals):
+        """
+        Verify many revealed commitments at once (e.g. when auditing a match log).
+        
+        Args:
+            reveals: Iterable of (commitment, value, nonce) tuples; commitments as bytes or hex
+            
+        Returns:
+            List of booleans, one per tuple, in input order
+        """
+        return [_digest_matches(commitment, _commitment_digest(value, nonce))
+                for commitment, value, nonce in reveals]
+
+
+# Below this many dice the plain list path is faster than importing and calling NumPy
+_VECTOR_DICE_THRESHOLD = 64
+
+
+def _roll_dice_vectorized(num_dice):
+    """
+    Roll num_dice dice with NumPy, using the same CSPRNG bytes and rejection rule as roll_dice.
+    
+    Args:
+        num_dice: Number of dice to roll
+        
+    Returns:
+        uint8 array of dice results (each 1-6), or None if NumPy is not installed
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    
+    faces = np.empty(0, dtype=np.uint8)
+    while faces.size < num_dice:
+        missing = num_dice - faces.size
+        raw = np.frombuffer(os.urandom(2 * missing), dtype=np.uint8)
+        faces = np.concatenate((faces, raw[raw < 252][:missing] % 6 + 1))
+    return faces
 
 
 class DiceLogic:
@@ -76,13 +187,33 @@ class DiceLogic:
         Returns:
             List of dice results (each 1-6)
         """
-        return [random.randint(1, 6) for _ in range(num_dice)]
+        if num_dice >= _VECTOR_DICE_THRESHOLD:
+            faces = _roll_dice_vectorized(num_dice)
+            if faces is not None:
+                return faces.tolist()
+        
+        # One OS CSPRNG read per batch; bytes >= 252 are rejected so every face stays equally likely
+        dice = []
+        while len(dice) < num_dice:
+            missing = num_dice - len(dice)
+            dice += [b % 6 + 1 for b in os.urandom(2 * missing) if b < 252][:missing]
+        return dice
     
     @staticmethod
     def calculate_sum(dice_results):
         """Calculate the sum of dice results."""
         return sum(dice_results)
     
+    @staticmethod
+    def is_valid_num_dice(num_dice):
+        """Check that a requested dice count is an integer in [1, MAX_DICE]."""
+        return type(num_dice) is int and 1 <= num_dice <= MAX_DICE
+    
+    @staticmethod
+    def is_valid_sum(total, num_dice):
+        """Check that a revealed sum is an integer num_dice dice can actually roll."""
+        return type(total) is int and num_dice <= total <= 6 * num_dice
+    
     @staticmethod
     def determine_winner(sum1, sum2):
         """
@@ -95,12 +226,8 @@ class DiceLogic:
         Returns:
             1 if player 1 wins, 2 if player 2 wins, 0 for tie
         """
-        if sum1 > sum2:
-            return 1  # Player 1 wins
-        elif sum2 > sum1:
-            return 2  # Player 2 wins
-        else:
-            return 0  # Tie
+        # At most one comparison is true, so this maps straight onto 1 / 2 / 0
+        return (sum1 > sum2) + 2 * (sum2 > sum1)
     
     @staticmethod
     def get_result_message(winner, alice_sum, bob_sum):
@@ -131,6 +258,34 @@ class DiceLogic:
         return msg
 
 
+def _message_prefix(msg_type):
+    """Encoded '{"type":<msg_type>,"data":' head of a protocol message."""
+    return b'{"type":%s,"data":' % json.dumps(msg_type).encode('utf-8')
+
+
+# Heads of every known message type, encoded once: only the data part is serialized per message
+_MESSAGE_PREFIXES = {
+    msg_type: _message_prefix(msg_type)
+    for msg_type in (MSG_COMMIT, MSG_RESULT, MSG_REVEAL, MSG_MATCH_RESULT, MSG_ERROR)
+}
+
+
+def _encode_message(msg_type, data):
+    """Serialize a protocol message to UTF-8 JSON bytes (orjson when installed)."""
+    prefix = _MESSAGE_PREFIXES.get(msg_type)
+    if prefix is None:
+        prefix = _message_prefix(msg_type)
+    if orjson is not None:
+        body = orjson.dumps(data)
+    else:
+        body = json.dumps(data).encode('utf-8')
+    return prefix + body + b'}'
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so parse() handles both the same way
+_decode_json = orjson.loads if orjson is not None else json.loads
+
+
 class ProtocolMessage:
     """Helper class for creating and parsing protocol messages."""
     
@@ -146,8 +301,7 @@ class ProtocolMessage:
         Returns:
             JSON-encoded message string
         """
-        message = {"type": msg_type, "data": kwargs}
-        return json.dumps(message)
+        return _encode_message(msg_type, kwargs).decode('utf-8')
     
     @staticmethod
     def parse(message_str):
@@ -155,13 +309,13 @@ class ProtocolMessage:
         Parse a protocol message.
         
         Args:
-            message_str: JSON-encoded message string
+            message_str: JSON-encoded message (string or UTF-8 bytes)
             
         Returns:
             Dictionary with 'type' and 'data' keys
         """
         try:
-            message = json.loads(message_str)
+            message = _decode_json(message_str)
             if "type" not in message or "data" not in message:
                 raise ValueError("Invalid message format")
             return message
@@ -169,6 +323,71 @@ class ProtocolMessage:
             raise ValueError(f"Failed to parse message: {e}")
 
 
+def setup_logging(verbose=None):
+    """
+    Route game output through a buffered logging handler.
+    
+    Records are collected in memory and written to stdout in batches (errors are written
+    immediately, everything left is flushed at exit), instead of one flushed write per line.
+    
+    Args:
+        verbose: Show the step-by-step game log; defaults to the VERBOSE environment variable.
+            When off, only errors are shown.
+    """
+    if verbose is None:
+        verbose = os.environ.get('VERBOSE', '0') not in ('', '0')
+    
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter('%(message)s'))
+    handler = logging.handlers.MemoryHandler(
+        capacity=64, flushLevel=logging.ERROR, target=stream
+    )
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.WARNING,
+        handlers=[handler]
+    )
+
+
+def flush_logging():
+    """Write out any buffered log records now, e.g. once a game is over."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+def connect_to_server(host, port, wait=0.0, retry_interval=0.1):
+    """
+    Open a TCP connection, retrying while the server is not accepting yet.
+    
+    Args:
+        host: Server host name or address
+        port: Server port
+        wait: Seconds to keep retrying before giving up (0 tries once)
+        retry_interval: Seconds between attempts
+        
+    Returns:
+        Connected socket with TCP_NODELAY set
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except (ConnectionRefusedError, socket.gaierror):
+            # The server (or its DNS name, under Docker) may simply not be up yet
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(retry_interval)
+    
+    # Commit/reveal messages are tiny: send each one immediately instead of batching
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+# Each message is framed as a 4-byte big-endian payload length followed by the JSON payload
+_FRAME_HEADER = struct.Struct('>I')
+MAX_MESSAGE_SIZE = 1 << 20
+
+
 def send_message(sock, msg_type, **kwargs):
     """
     Send a protocol message over a socket.
@@ -178,8 +397,30 @@ def send_message(sock, msg_type, **kwargs):
         msg_type: Message type
         **kwargs: Message data
     """
-    message = ProtocolMessage.create(msg_type, **kwargs)
-    sock.sendall(message.encode('utf-8') + b'\n')
+    payload = _encode_message(msg_type, kwargs)
+    sock.sendall(_FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, num_bytes):
+    """
+    Read exactly num_bytes from a socket into a preallocated buffer.
+    
+    Args:
+        sock: Socket object
+        num_bytes: Number of bytes to read
+        
+    Returns:
+        bytearray holding the received bytes
+    """
+    buffer = bytearray(num_bytes)
+    view = memoryview(buffer)
+    received = 0
+    while received < num_bytes:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("Connection closed")
+        received += n
+    return buffer
 
 
 def receive_message(sock):
@@ -192,15 +433,47 @@ def receive_message(sock):
     Returns:
         Parsed message dictionary
     """
-    # Read until newline
-    data = b''
-    while True:
-        chunk = sock.recv(1)
-        if not chunk:
-            raise ConnectionError("Connection closed")
-        if chunk == b'\n':
-            break
-        data += chunk
+    # The length prefix says exactly how much to read, so no delimiter scan is needed
+    (length,) = _FRAME_HEADER.unpack(_recv_exact(sock, _FRAME_HEADER.size))
+    if length > MAX_MESSAGE_SIZE:
+        # The payload is still in the stream, so the framing is lost: drop the connection
+        raise ConnectionError(f"Message too large: {length} bytes")
+    
+    # Both JSON backends decode UTF-8 bytes directly
+    return ProtocolMessage.parse(bytes(_recv_exact(sock, length)))
+
+
+async def send_message_async(writer, msg_type, **kwargs):
+    """
+    Send a protocol message over an asyncio stream.
+    
+    Args:
+        writer: asyncio StreamWriter
+        msg_type: Message type
+        **kwargs: Message data
+    """
+    payload = _encode_message(msg_type, kwargs)
+    writer.write(_FRAME_HEADER.pack(len(payload)) + payload)
+    await writer.drain()
+
+
+async def receive_message_async(reader):
+    """
+    Receive a protocol message from an asyncio stream.
+    
+    Args:
+        reader: asyncio StreamReader
+        
+    Returns:
+        Parsed message dictionary
+    """
+    try:
+        (length,) = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+        if length > MAX_MESSAGE_SIZE:
+            # The payload is still in the stream, so the framing is lost: drop the connection
+            raise ConnectionError(f"Message too large: {length} bytes")
+        payload = await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        raise ConnectionError("Connection closed")
     
-    message_str = data.decode('utf-8')
-    return ProtocolMessage.parse(message_str)
+    return ProtocolMessage.parse(payload)